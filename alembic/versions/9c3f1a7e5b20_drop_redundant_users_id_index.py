@@ -0,0 +1,28 @@
+"""Drop redundant ix_users_id index
+
+Revision ID: 9c3f1a7e5b20
+Revises: 4b7e2c91d0a3
+Create Date: 2026-10-18 11:03:27.845102
+
+"""
+from typing import Sequence, Union
+
+from app.core.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f1a7e5b20'
+down_revision: Union[str, None] = '4b7e2c91d0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Первичный ключ уже индексирован users_pkey, ix_users_id только замедляет вставки
+    drop_index_concurrently('ix_users_id', 'users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently('ix_users_id', 'users', ['id'])
@@ -0,0 +1,46 @@
+"""Add username prefix and trigram search indexes
+
+Revision ID: b5a27d3e9f14
+Revises: e1d84b6f2c57
+Create Date: 2026-10-18 14:22:51.604317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5a27d3e9f14'
+down_revision: Union[str, None] = 'e1d84b6f2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    create_index_concurrently(
+        'ix_users_username_prefix',
+        'users',
+        [sa.text('lower(username) COLLATE "C"'), 'id'],
+        postgresql_include=['username'],
+    )
+    create_index_concurrently(
+        'ix_users_username_trgm',
+        'users',
+        [sa.text('lower(username) gist_trgm_ops')],
+        postgresql_using='gist',
+    )
+    # Поиск идёт по lower(username), обычный индекс по username не используется
+    drop_index_concurrently('ix_users_username', 'users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently('ix_users_username', 'users', ['username'])
+    drop_index_concurrently('ix_users_username_trgm', 'users')
+    drop_index_concurrently('ix_users_username_prefix', 'users')
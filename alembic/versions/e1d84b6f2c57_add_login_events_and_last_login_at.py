@@ -0,0 +1,42 @@
+"""Add login_events table and users.last_login_at
+
+Revision ID: e1d84b6f2c57
+Revises: 9c3f1a7e5b20
+Create Date: 2026-10-18 12:41:09.337215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1d84b6f2c57'
+down_revision: Union[str, None] = '9c3f1a7e5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('login_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=16), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_login_events_user_id'), 'login_events', ['user_id'], unique=False)
+    # Nullable-колонка без DEFAULT добавляется без перезаписи таблицы
+    op.add_column('users', sa.Column('last_login_at', sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'last_login_at')
+    op.drop_index(op.f('ix_login_events_user_id'), table_name='login_events')
+    op.drop_table('login_events')
@@ -0,0 +1,37 @@
+"""Add case-insensitive unique index on username
+
+Revision ID: f6b31d8a4e20
+Revises: c3e8a5f17d62
+Create Date: 2026-10-19 11:02:17.845390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b31d8a4e20'
+down_revision: Union[str, None] = 'c3e8a5f17d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Падает, если в таблице уже есть имена, различающиеся только регистром:
+    # их нужно переименовать до миграции, невалидный индекс удалится при повторе
+    create_index_concurrently(
+        'ix_users_username_lower_unique',
+        'users',
+        [sa.text('lower(username)')],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_users_username_lower_unique', 'users')
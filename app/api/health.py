@@ -0,0 +1,47 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.core.admission import cost_classes
+from app.core.email_filter import email_filter
+from app.core.shared_cache import get_shared_cache
+from app.core.warmup import readiness
+from app.services.audit_service import login_audit
+
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def live():
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def ready():
+    if not readiness.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warm_up_failed" if readiness.failed else "warming_up"},
+        )
+    return {"status": "ready"}
+
+
+@router.get("/admission")
+async def admission_metrics():
+    return {name: cost_class.stats() for name, cost_class in cost_classes.items()}
+
+
+@router.get("/audit")
+async def audit_metrics():
+    return login_audit.stats()
+
+
+@router.get("/email-filter")
+async def email_filter_metrics():
+    return email_filter.stats()
+
+
+@router.get("/shared-cache")
+async def shared_cache_metrics():
+    cache = get_shared_cache()
+    return {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
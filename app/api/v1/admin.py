@@ -0,0 +1,53 @@
+import json
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.dependencies import get_user_repository, require_admin
+from app.repositories.base import UserRepositoryProtocol
+from app.api.v1.schemas import UserPageResponse
+from app.core.logging_config import setup_logger
+from app.core.config import settings
+
+
+logger = setup_logger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/users", response_model=UserPageResponse)
+async def list_users(
+    after_id: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
+):
+    # Берём на одну строку больше, чтобы не отдавать пустую последнюю страницу
+    users = await repository.list_users(after_id, limit + 1)
+    next_after_id = users[limit - 1].id if len(users) > limit else None
+    return {"items": users[:limit], "next_after_id": next_after_id}
+
+
+@router.get("/users/export")
+async def export_users(
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
+):
+    async def _ndjson_chunks():
+        exported = 0
+        async for rows in repository.stream_users(settings.EXPORT_CHUNK_SIZE):
+            exported += len(rows)
+            yield "".join(
+                json.dumps(
+                    {
+                        "id": row["id"],
+                        "username": row["username"],
+                        "email": row["email"],
+                        "created_at": row["created_at"].isoformat(),
+                    },
+                    separators=(",", ":"),
+                )
+                + "\n"
+                for row in rows
+            )
+        logger.info(f"Users exported: {exported}")
+
+    return StreamingResponse(_ndjson_chunks(), media_type="application/x-ndjson")
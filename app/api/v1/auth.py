@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, Response
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.dependencies import get_async_session, get_current_user, get_refresh_token
+from fastapi import APIRouter, Cookie, Depends, Header, Request, Response
+from app.core.dependencies import (
+    get_user_repository,
+    get_refresh_token_repository,
+    get_current_user,
+    get_refresh_token,
+)
+from app.repositories.base import RefreshTokenRepositoryProtocol, UserRepositoryProtocol
 from app.core.security import AuthService
+from app.core.idempotency import register_idempotency, request_fingerprint
+from app.services.audit_service import login_audit
+from app.services.token_service import TokenService
 from app.services.user_service import UserService
 from app.api.v1.schemas import UserCreate, UserLogin, UserResponse, TokenResponse
 from app.models.user import User
@@ -24,32 +32,63 @@ async def set_refresh_token_cookie(response: Response, refresh_token: str):
     )
 
 
+def record_login_event(request: Request, user_id: int, event_type: str):
+    login_audit.record(
+        user_id,
+        event_type,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+    )
+
+
 @router.post("/register", response_model=UserResponse)
 async def register(
-    user_data: UserCreate, session: AsyncSession = Depends(get_async_session)
+    user_data: UserCreate,
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
+    idempotency_key: str | None = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
 ):
-    hashed_password = AuthService.get_password_hash(user_data.password)
-    user = await UserService.create_user(
-        session, user_data.username, user_data.email, hashed_password
+    async def _create_user():
+        hashed_password = AuthService.get_password_hash(user_data.password)
+        user = await UserService.create_user(
+            repository, user_data.username, user_data.email, hashed_password
+        )
+        logger.info(f"User registered: {user.email}")
+        return user
+
+    if idempotency_key is None:
+        return await _create_user()
+
+    async def _create_user_content() -> dict:
+        user = await _create_user()
+        return UserResponse.model_validate(user).model_dump(mode="json")
+
+    # Повтор с тем же ключом отдаёт сохранённый ответ без bcrypt и запросов к users
+    return await register_idempotency.execute(
+        idempotency_key, request_fingerprint(user_data.model_dump()), _create_user_content
     )
-    logger.info(f"User registered: {user.email}")
-    return user
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
+    request: Request,
     response: Response,
     user_data: UserLogin,
-    session: AsyncSession = Depends(get_async_session),
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
+    token_repository: RefreshTokenRepositoryProtocol = Depends(
+        get_refresh_token_repository
+    ),
 ):
     user = await UserService.authenticate_user(
-        session, user_data.email, user_data.password
+        repository, user_data.email, user_data.password
     )
 
     access_token = AuthService.create_access_token({"sub": str(user.id)})
-    refresh_token = AuthService.create_refresh_token({"sub": str(user.id)})
+    refresh_token = await TokenService.issue_refresh_token(token_repository, user.id)
 
     await set_refresh_token_cookie(response, refresh_token)
+    record_login_event(request, user.id, "login")
 
     logger.info(f"User logged in: {user.email}")
     return {"access_token": access_token, "token_type": "bearer"}
@@ -57,19 +96,23 @@ async def login(
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
+    request: Request,
     response: Response,
     refresh_token: str = Depends(get_refresh_token),
-    session: AsyncSession = Depends(get_async_session),
+    token_repository: RefreshTokenRepositoryProtocol = Depends(
+        get_refresh_token_repository
+    ),
 ):
-    user = await AuthService.get_current_user(
-        refresh_token, session, expected_type="refresh"
+    # Пользователь не загружается: токен в хранилище удаляется каскадно вместе с ним
+    user_id, new_refresh_token = await TokenService.rotate_refresh_token(
+        token_repository, refresh_token
     )
-    access_token = AuthService.create_access_token({"sub": str(user.id)})
-    new_refresh_token = AuthService.create_refresh_token({"sub": str(user.id)})
+    access_token = AuthService.create_access_token({"sub": str(user_id)})
 
     await set_refresh_token_cookie(response, new_refresh_token)
+    record_login_event(request, user_id, "refresh")
 
-    logger.info(f"Token refreshed for user: {user.email}")
+    logger.info(f"Token refreshed for user id: {user_id}")
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -80,7 +123,16 @@ async def get_me(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout(response: Response, current_user: User = Depends(get_current_user)):
+async def logout(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    refresh_token: str | None = Cookie(default=None),
+    token_repository: RefreshTokenRepositoryProtocol = Depends(
+        get_refresh_token_repository
+    ),
+):
+    if refresh_token is not None:
+        await TokenService.revoke_refresh_token(token_repository, refresh_token)
     response.delete_cookie("refresh_token")
 
     logger.info(f"User logged out: {current_user.email}")
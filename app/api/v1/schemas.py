@@ -43,3 +43,32 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
 
     model_config = ConfigDict(extra="forbid")
+
+
+class UserPageResponse(BaseModel):
+    items: list[UserResponse]
+    next_after_id: int | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class UsernameItem(BaseModel):
+    id: int
+    username: str
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class UsernameSearchResponse(BaseModel):
+    items: list[UsernameItem]
+    next_after_username: str | None = None
+    next_after_id: int | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class UsernameAvailabilityResponse(BaseModel):
+    username: str
+    available: bool
+
+    model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core.dependencies import get_user_repository
+from app.repositories.base import UserRepositoryProtocol
+from app.api.v1.schemas import UsernameAvailabilityResponse, UsernameSearchResponse
+
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+MAX_SEARCH_LIMIT = 20
+
+
+@router.get("/search", response_model=UsernameSearchResponse)
+async def search_usernames(
+    prefix: str = Query(..., min_length=1, max_length=50),
+    after_username: str | None = Query(default=None, max_length=50),
+    after_id: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=10, ge=1, le=MAX_SEARCH_LIMIT),
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
+):
+    # Курсор - (username, id) последнего элемента; без OFFSET каждая страница
+    # читает из индекса не больше limit + 1 строк
+    after = (
+        (after_username, after_id)
+        if after_username is not None and after_id is not None
+        else None
+    )
+    rows = await repository.search_usernames(prefix, after, limit + 1)
+    items = [{"id": user_id, "username": username} for user_id, username in rows[:limit]]
+    if len(rows) > limit:
+        return {
+            "items": items,
+            "next_after_username": items[-1]["username"],
+            "next_after_id": items[-1]["id"],
+        }
+    return {"items": items}
+
+
+@router.get("/search/fuzzy", response_model=UsernameSearchResponse)
+async def search_usernames_fuzzy(
+    q: str = Query(..., min_length=3, max_length=50),
+    limit: int = Query(default=10, ge=1, le=MAX_SEARCH_LIMIT),
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
+):
+    rows = await repository.search_usernames_fuzzy(q, limit)
+    return {"items": [{"id": user_id, "username": username} for user_id, username in rows]}
+
+
+@router.get("/availability", response_model=UsernameAvailabilityResponse)
+async def username_availability(
+    username: str = Query(..., min_length=3, max_length=50),
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
+):
+    return {
+        "username": username,
+        "available": not await repository.username_exists(username),
+    }
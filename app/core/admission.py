@@ -0,0 +1,145 @@
+import asyncio
+from collections import deque
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+class CostClass:
+    """
+    Ограничитель одновременных запросов одного класса стоимости.
+
+    Запрос либо сразу получает слот, либо ждёт в очереди не дольше
+    `queue_timeout`. При переполненной очереди или истёкшем сроке ожидания
+    запрос отбрасывается, а не копится в виде задержки.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.shed_queue_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as e:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # Слот передан в момент отмены - возвращаем его следующему
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                self.shed_timeout += 1
+                return False
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self):
+        # Слот передаётся первому ожидающему без уменьшения in_flight
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+cost_classes = {
+    "expensive": CostClass(
+        "expensive",
+        settings.ADMISSION_EXPENSIVE_MAX_IN_FLIGHT,
+        settings.ADMISSION_EXPENSIVE_MAX_QUEUE,
+        settings.ADMISSION_EXPENSIVE_QUEUE_TIMEOUT_MS / 1000,
+    ),
+    "cheap": CostClass(
+        "cheap",
+        settings.ADMISSION_CHEAP_MAX_IN_FLIGHT,
+        settings.ADMISSION_CHEAP_MAX_QUEUE,
+        settings.ADMISSION_CHEAP_QUEUE_TIMEOUT_MS / 1000,
+    ),
+    "bulk": CostClass(
+        "bulk",
+        settings.ADMISSION_BULK_MAX_IN_FLIGHT,
+        settings.ADMISSION_BULK_MAX_QUEUE,
+        settings.ADMISSION_BULK_QUEUE_TIMEOUT_MS / 1000,
+    ),
+}
+
+# Маршруты без класса (например, /health) не ограничиваются
+ROUTE_COST_CLASSES = {
+    "/api/v1/auth/register": "expensive",
+    "/api/v1/auth/login": "expensive",
+    "/api/v1/auth/refresh": "cheap",
+    "/api/v1/auth/me": "cheap",
+    "/api/v1/auth/logout": "cheap",
+    "/api/v1/admin/users": "cheap",
+    "/api/v1/users/search": "cheap",
+    "/api/v1/users/search/fuzzy": "cheap",
+    "/api/v1/users/availability": "cheap",
+    "/api/v1/admin/users/export": "bulk",
+}
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware, отбрасывающий лишние запросы с 503 и Retry-After"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        cost_class = None
+        if scope["type"] == "http" and settings.ADMISSION_ENABLED:
+            class_name = ROUTE_COST_CLASSES.get(scope["path"])
+            cost_class = cost_classes.get(class_name)
+        if cost_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await cost_class.acquire():
+            logger.debug(f"Request shed: {scope['path']} ({cost_class.name})")
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Service is overloaded. Please retry later."},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            cost_class.release()
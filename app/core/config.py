@@ -16,11 +16,83 @@ class Settings:
     DSN: str = (
         f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    # postgres | memory (in-memory репозитории для нагрузочных тестов)
+    REPOSITORY_BACKEND: str = os.getenv("REPOSITORY_BACKEND", "postgres")
+    # Сколько DDL миграции ждёт блокировку, прежде чем упасть
+    MIGRATION_LOCK_TIMEOUT_MS: int = int(os.getenv("MIGRATION_LOCK_TIMEOUT_MS", 5000))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+
+    # Прогрев воркера перед тем, как /health/ready начнёт отвечать 200
+    WARMUP_POOL_CONNECTIONS: int = int(os.getenv("WARMUP_POOL_CONNECTIONS", DB_POOL_SIZE))
+    WARMUP_RETRY_SECONDS: float = float(os.getenv("WARMUP_RETRY_SECONDS", 5))
 
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-key")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
+    # Очистка истёкших refresh-токенов небольшими пачками
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: float = float(
+        os.getenv("REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS", 300)
+    )
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = int(os.getenv("REFRESH_TOKEN_SWEEP_BATCH_SIZE", 500))
+    REFRESH_TOKEN_SWEEP_PAUSE_MS: int = int(os.getenv("REFRESH_TOKEN_SWEEP_PAUSE_MS", 50))
+
+    # Idempotency-Key для /register: ключи в Postgres, общие для всех воркеров
+    IDEMPOTENCY_MAX_KEYS: int = int(os.getenv("IDEMPOTENCY_MAX_KEYS", 10_000))
+    IDEMPOTENCY_TTL_SECONDS: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+    IDEMPOTENCY_IN_FLIGHT_TIMEOUT_SECONDS: float = float(
+        os.getenv("IDEMPOTENCY_IN_FLIGHT_TIMEOUT_SECONDS", 30)
+    )
+    IDEMPOTENCY_POLL_INTERVAL_MS: int = int(os.getenv("IDEMPOTENCY_POLL_INTERVAL_MS", 50))
+    IDEMPOTENCY_SWEEP_INTERVAL_SECONDS: float = float(
+        os.getenv("IDEMPOTENCY_SWEEP_INTERVAL_SECONDS", 3600)
+    )
+    IDEMPOTENCY_SWEEP_BATCH_SIZE: int = int(os.getenv("IDEMPOTENCY_SWEEP_BATCH_SIZE", 500))
+    IDEMPOTENCY_SWEEP_PAUSE_MS: int = int(os.getenv("IDEMPOTENCY_SWEEP_PAUSE_MS", 50))
+
+    # Фильтр Блума по email для отсечения входов несуществующих пользователей
+    EMAIL_FILTER_ENABLED: bool = os.getenv("EMAIL_FILTER_ENABLED", "true").lower() == "true"
+    EMAIL_FILTER_CAPACITY: int = int(os.getenv("EMAIL_FILTER_CAPACITY", 1_000_000))
+    EMAIL_FILTER_FP_RATE: float = float(os.getenv("EMAIL_FILTER_FP_RATE", 0.01))
+    EMAIL_FILTER_BATCH_SIZE: int = int(os.getenv("EMAIL_FILTER_BATCH_SIZE", 10_000))
+
+    # Кэш токенов и пользователей в разделяемой памяти, общий для воркеров хоста
+    SHARED_CACHE_ENABLED: bool = os.getenv("SHARED_CACHE_ENABLED", "false").lower() == "true"
+    SHARED_CACHE_DIR: str = os.getenv("SHARED_CACHE_DIR", "/dev/shm")
+    SHARED_CACHE_SLOTS: int = int(os.getenv("SHARED_CACHE_SLOTS", 16_384))
+    SHARED_CACHE_SLOT_SIZE: int = int(os.getenv("SHARED_CACHE_SLOT_SIZE", 512))
+    SHARED_CACHE_TTL_SECONDS: float = float(os.getenv("SHARED_CACHE_TTL_SECONDS", 60))
+
+    # Write-behind журнал входов
+    AUDIT_QUEUE_MAX_SIZE: int = int(os.getenv("AUDIT_QUEUE_MAX_SIZE", 10_000))
+    AUDIT_FLUSH_BATCH_SIZE: int = int(os.getenv("AUDIT_FLUSH_BATCH_SIZE", 500))
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", 1))
+
+    # Ключ для /admin эндпоинтов (заголовок X-Admin-Key); пустой - админка выключена
+    ADMIN_API_KEY: str = os.getenv("ADMIN_API_KEY", "")
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+
+    # Admission control: лимиты одновременных запросов по классам стоимости
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", 1))
+    ADMISSION_EXPENSIVE_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_EXPENSIVE_MAX_IN_FLIGHT", 4))
+    ADMISSION_EXPENSIVE_MAX_QUEUE: int = int(os.getenv("ADMISSION_EXPENSIVE_MAX_QUEUE", 16))
+    ADMISSION_EXPENSIVE_QUEUE_TIMEOUT_MS: int = int(
+        os.getenv("ADMISSION_EXPENSIVE_QUEUE_TIMEOUT_MS", 500)
+    )
+    ADMISSION_CHEAP_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_CHEAP_MAX_IN_FLIGHT", 64))
+    ADMISSION_CHEAP_MAX_QUEUE: int = int(os.getenv("ADMISSION_CHEAP_MAX_QUEUE", 256))
+    ADMISSION_CHEAP_QUEUE_TIMEOUT_MS: int = int(os.getenv("ADMISSION_CHEAP_QUEUE_TIMEOUT_MS", 100))
+    ADMISSION_BULK_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_BULK_MAX_IN_FLIGHT", 2))
+    ADMISSION_BULK_MAX_QUEUE: int = int(os.getenv("ADMISSION_BULK_MAX_QUEUE", 0))
+    ADMISSION_BULK_QUEUE_TIMEOUT_MS: int = int(os.getenv("ADMISSION_BULK_QUEUE_TIMEOUT_MS", 0))
+
+    # Профилирование: по заголовку X-Profile с токеном или для доли запросов
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", 0.0))
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", 5))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
 
 
 settings = Settings()
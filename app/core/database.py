@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, Callable, TypeVar
+
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.logging_config import setup_logger
@@ -7,13 +10,36 @@ from app.core.config import settings
 logger = setup_logger(__name__)
 
 
-engine = create_async_engine(url=settings.DSN, echo=False, pool_size=5, max_overflow=10)
+engine = create_async_engine(
+    url=settings.DSN,
+    echo=False,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+)
 
 async_session_factory = async_sessionmaker(
     bind=engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
 )
 
 
+RepositoryT = TypeVar("RepositoryT")
+
+# Открывает репозиторий на время фоновой задачи (`async with factory() as repository`)
+RepositoryFactory = Callable[[], AsyncContextManager[RepositoryT]]
+
+
+def postgres_repository(
+    repository_class: Callable[[AsyncSession], RepositoryT],
+) -> RepositoryFactory[RepositoryT]:
+    """Фабрика репозитория на собственной сессии, вне сессии запроса"""
+    @asynccontextmanager
+    async def _factory():
+        async with async_session_factory() as session:
+            yield repository_class(session)
+
+    return _factory
+
+
 async def init_db():
     logger.info("Initializing database")
     try:
@@ -1,16 +1,25 @@
-from fastapi import Depends, HTTPException, status, Cookie
-from fastapi.security import OAuth2PasswordBearer
+import hmac
+
+from fastapi import Depends, FastAPI, HTTPException, status, Cookie
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import async_session_factory
 from app.core.security import AuthService
-from app.core.exceptions import DatabaseException, AppException
+from app.core.config import settings
+from app.core.exceptions import DatabaseException, AppException, ForbiddenException
 from app.core.logging_config import setup_logger
+from app.repositories.base import RefreshTokenRepositoryProtocol, UserRepositoryProtocol
+from app.repositories.memory_refresh_token_repository import InMemoryRefreshTokenRepository
+from app.repositories.memory_user_repository import InMemoryUserRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.user_repository import UserRepository
 
 
 logger = setup_logger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+admin_key_scheme = APIKeyHeader(name="X-Admin-Key", auto_error=False)
 
 
 async def get_async_session() -> AsyncSession:
@@ -30,11 +39,33 @@ async def get_async_session() -> AsyncSession:
             await session.close()
 
 
+async def get_user_repository(
+    session: AsyncSession = Depends(get_async_session),
+) -> UserRepositoryProtocol:
+    return UserRepository(session)
+
+
+async def get_refresh_token_repository(
+    session: AsyncSession = Depends(get_async_session),
+) -> RefreshTokenRepositoryProtocol:
+    return RefreshTokenRepository(session)
+
+
+def use_in_memory_repositories(app: FastAPI):
+    """Подменяет репозитории in-memory реализациями (нагрузочные тесты без Postgres)"""
+    user_repository = InMemoryUserRepository()
+    refresh_token_repository = InMemoryRefreshTokenRepository()
+    app.dependency_overrides[get_user_repository] = lambda: user_repository
+    app.dependency_overrides[get_refresh_token_repository] = lambda: refresh_token_repository
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_async_session),
+    repository: UserRepositoryProtocol = Depends(get_user_repository),
 ):
-    user = await AuthService.get_current_user(token, session, expected_type="access")
+    user = await AuthService.get_current_user(
+        token, repository, expected_type="access"
+    )
     return user
 
 
@@ -46,3 +77,12 @@ async def get_refresh_token(refresh_token: str | None = Cookie(default=None)):
         )
     logger.debug(f"Extracted refresh_token from cookie: {refresh_token}")
     return refresh_token
+
+
+async def require_admin(admin_key: str | None = Depends(admin_key_scheme)):
+    # Байты: compare_digest падает с TypeError на не-ASCII строках
+    if not settings.ADMIN_API_KEY or not admin_key or not hmac.compare_digest(
+        admin_key.encode(), settings.ADMIN_API_KEY.encode()
+    ):
+        logger.warning("Rejected admin request")
+        raise ForbiddenException()
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import math
+import time
+
+from app.core.config import settings
+from app.core.database import RepositoryFactory, postgres_repository
+from app.core.logging_config import setup_logger
+from app.repositories.base import UserRepositoryProtocol
+from app.repositories.user_repository import UserRepository
+
+
+logger = setup_logger(__name__)
+
+UserRepositoryFactory = RepositoryFactory[UserRepositoryProtocol]
+
+# Пропуски в последовательности id: транзакция могла получить id раньше,
+# а закоммититься позже уже прочитанных строк. Такие id перечитываются,
+# пока не появятся, но не дольше _GAP_TTL_SECONDS и только в хвосте таблицы.
+_GAP_WINDOW = 1000
+_GAP_TTL_SECONDS = 30.0
+
+
+postgres_user_repository = postgres_repository(UserRepository)
+
+
+class BloomFilter:
+    """Фильтр Блума с двойным хешированием blake2b"""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class EmailFilter:
+    """
+    Фильтр зарегистрированных email в памяти воркера.
+
+    Строится в фоне чтением таблицы users по возрастанию id. Пока фильтр не
+    готов, `might_exist` всегда возвращает True. Отрицательный ответ фильтра
+    проверяется общим для всех ожидающих запросом `id > watermark`,
+    начатым после прихода запроса: так учитываются пользователи,
+    зарегистрированные через другие воркеры. Ошибка этого запроса
+    трактуется как "email может существовать".
+    """
+
+    def __init__(self, capacity: int, fp_rate: float, batch_size: int):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.ready = False
+        self.emails = 0
+        self.definite_misses = 0
+        self._bloom = BloomFilter(capacity, fp_rate)
+        self._watermark = 0
+        self._gaps: dict[int, float] = {}
+        self._repository_factory: UserRepositoryFactory | None = None
+        self._catch_up_task: asyncio.Task | None = None
+        self._catch_up_started = 0.0
+
+    def add(self, email: str):
+        self._bloom.add(email)
+
+    def _apply(self, rows: list[tuple[int, str]]):
+        now = time.monotonic()
+        for user_id, email in rows:
+            self._bloom.add(email)
+            if self._gaps.pop(user_id, None) is not None:
+                self.emails += 1
+            if user_id > self._watermark:
+                self.emails += 1
+                if user_id - self._watermark - 1 <= _GAP_WINDOW:
+                    for missing_id in range(self._watermark + 1, user_id):
+                        self._gaps[missing_id] = now
+                self._watermark = user_id
+        self._gaps = {
+            user_id: seen_at
+            for user_id, seen_at in self._gaps.items()
+            if now - seen_at < _GAP_TTL_SECONDS and user_id > self._watermark - _GAP_WINDOW
+        }
+
+    async def _load(self, repository: UserRepositoryProtocol):
+        after_id = min(self._gaps, default=self._watermark + 1) - 1
+        while True:
+            rows = await repository.list_emails(after_id, self.batch_size)
+            self._apply(rows)
+            if len(rows) < self.batch_size:
+                return
+            after_id = rows[-1][0]
+
+    async def build(self, repository_factory: UserRepositoryFactory):
+        started = time.perf_counter()
+        self._repository_factory = repository_factory
+        async with repository_factory() as repository:
+            await self._load(repository)
+        self.ready = True
+        logger.info(
+            f"Email filter built: {self.emails} emails "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        if self.emails > self.capacity:
+            logger.warning(
+                f"Email filter holds {self.emails} emails over capacity "
+                f"{self.capacity}, false positive rate is above the configured one"
+            )
+
+    async def _catch_up(self):
+        async with self._repository_factory() as repository:
+            await self._load(repository)
+
+    async def _catch_up_since(self, arrived_at: float):
+        # Одновременные промахи ждут одну и ту же догоняющую выборку
+        while True:
+            task = self._catch_up_task
+            if task is None or task.done():
+                self._catch_up_started = time.monotonic()
+                task = self._catch_up_task = asyncio.create_task(self._catch_up())
+            started = self._catch_up_started
+            await asyncio.shield(task)
+            if started >= arrived_at:
+                return
+
+    async def might_exist(self, email: str) -> bool:
+        if not self.ready or email in self._bloom:
+            return True
+        try:
+            await self._catch_up_since(time.monotonic())
+        except Exception as e:
+            logger.error(f"Email filter catch-up failed: {e}")
+            return True
+        if email in self._bloom:
+            return True
+        self.definite_misses += 1
+        return False
+
+    def stats(self) -> dict:
+        # Отдаётся без авторизации: число email - это число аккаунтов, его здесь нет
+        return {
+            "ready": self.ready,
+            "capacity": self.capacity,
+            "over_capacity": self.emails > self.capacity,
+            "definite_misses": self.definite_misses,
+        }
+
+
+email_filter = EmailFilter(
+    settings.EMAIL_FILTER_CAPACITY,
+    settings.EMAIL_FILTER_FP_RATE,
+    settings.EMAIL_FILTER_BATCH_SIZE,
+)
+
+
+async def run_email_filter_build():
+    """Строит фильтр в фоне, повторяя попытки при ошибках БД"""
+    while True:
+        try:
+            await email_filter.build(postgres_user_repository)
+            return
+        except Exception as e:
+            logger.error(
+                f"Email filter build failed: {e}. Retrying in {settings.WARMUP_RETRY_SECONDS}s"
+            )
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
@@ -35,4 +35,16 @@ class InvalidCredentialsException(AppException):
 class InvalidTokenException(AppException):
     def __init__(self):
         super().__init__(status_code=status.HTTP_401_UNAUTHORIZED,
-                         detail="Invalid token")
\ No newline at end of file
+                         detail="Invalid token")
+
+
+class ForbiddenException(AppException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_403_FORBIDDEN,
+                         detail="Forbidden")
+
+
+class IdempotencyKeyReusedException(AppException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_409_CONFLICT,
+                         detail="Idempotency-Key was already used with a different request")
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import hmac
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.database import RepositoryFactory, postgres_repository
+from app.core.exceptions import AppException, IdempotencyKeyReusedException
+from app.core.logging_config import setup_logger
+from app.core.sweeper import run_sweeper
+from app.repositories.base import IdempotencyRepositoryProtocol
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.memory_idempotency_repository import InMemoryIdempotencyRepository
+
+
+logger = setup_logger(__name__)
+
+IdempotencyRepositoryFactory = RepositoryFactory[IdempotencyRepositoryProtocol]
+
+postgres_idempotency_repository = postgres_repository(IdempotencyRepository)
+
+
+_memory_idempotency_repository = InMemoryIdempotencyRepository(settings.IDEMPOTENCY_MAX_KEYS)
+
+
+@asynccontextmanager
+async def memory_idempotency_repository():
+    yield _memory_idempotency_repository
+
+
+def request_fingerprint(data: dict) -> str:
+    # HMAC, а не голый хеш: в теле запроса есть пароль
+    body = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+class StoredResponse:
+    def __init__(self, status_code: int, content: dict):
+        self.status_code = status_code
+        self.content = content
+
+    def to_response(self, replayed: bool) -> JSONResponse:
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return JSONResponse(
+            status_code=self.status_code, content=self.content, headers=headers
+        )
+
+
+class IdempotencyStore:
+    """
+    Выполнение запроса не больше одного раза на ключ Idempotency-Key.
+
+    Ключ занимается в общем хранилище (Postgres, на in-memory бэкенде - память
+    процесса) до выполнения обработчика, поэтому повтор на любом воркере
+    получает сохранённый ответ (успех или ошибку 4xx) без выполнения
+    обработчика, а дубликат, пришедший во время выполнения, опрашивает ключ
+    до готовности ответа. Дубликаты внутри воркера ждут исходный запрос без
+    опроса. После ответа 5xx ключ освобождается и повтор выполнится заново;
+    захват, не завершённый за `in_flight_timeout`, считается брошенным.
+    """
+
+    def __init__(self, ttl: float, in_flight_timeout: float, poll_interval: float):
+        self.ttl = ttl
+        self.in_flight_timeout = in_flight_timeout
+        self.poll_interval = poll_interval
+        self.repository_factory: IdempotencyRepositoryFactory = memory_idempotency_repository
+        self._in_flight: dict[str, tuple[str, asyncio.Future]] = {}
+
+    async def execute(
+        self, key: str, fingerprint: str, handler: Callable[[], Awaitable[dict]]
+    ) -> JSONResponse:
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            in_flight_fingerprint, future = in_flight
+            if in_flight_fingerprint != fingerprint:
+                raise IdempotencyKeyReusedException()
+            stored = await asyncio.shield(future)
+            if stored is None:
+                # Исходный запрос упал с 5xx - выполняем заново
+                return await self.execute(key, fingerprint, handler)
+            return stored.to_response(replayed=True)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (fingerprint, future)
+        stored = None
+        try:
+            async with self.repository_factory() as repository:
+                stored, replayed = await self._execute(repository, key, fingerprint, handler)
+        finally:
+            del self._in_flight[key]
+            future.set_result(stored)
+        return stored.to_response(replayed=replayed)
+
+    async def _execute(
+        self,
+        repository: IdempotencyRepositoryProtocol,
+        key: str,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[dict]],
+    ) -> tuple[StoredResponse, bool]:
+        while True:
+            now = datetime.now(timezone.utc)
+            if await repository.claim(
+                key,
+                fingerprint,
+                now + timedelta(seconds=self.ttl),
+                now - timedelta(seconds=self.in_flight_timeout),
+            ):
+                break
+            record = await repository.get(key)
+            if record is None:
+                continue
+            if record.fingerprint != fingerprint:
+                raise IdempotencyKeyReusedException()
+            if record.status_code is not None:
+                logger.info(f"Replaying response for Idempotency-Key {key}")
+                return StoredResponse(record.status_code, record.response), True
+            # Исходный запрос ещё выполняется на другом воркере
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            stored = StoredResponse(200, await handler())
+        except AppException as e:
+            if e.status_code >= 500:
+                await repository.release(key)
+                raise
+            stored = StoredResponse(e.status_code, {"detail": e.detail})
+        except BaseException:
+            await repository.release(key)
+            raise
+        await repository.complete(key, stored.status_code, stored.content)
+        return stored, False
+
+
+register_idempotency = IdempotencyStore(
+    settings.IDEMPOTENCY_TTL_SECONDS,
+    settings.IDEMPOTENCY_IN_FLIGHT_TIMEOUT_SECONDS,
+    settings.IDEMPOTENCY_POLL_INTERVAL_MS / 1000,
+)
+
+
+async def run_idempotency_sweeper(repository_factory: IdempotencyRepositoryFactory):
+    """Фоновая задача удаления истёкших ключей Idempotency-Key"""
+    await run_sweeper(
+        "idempotency keys",
+        repository_factory,
+        settings.IDEMPOTENCY_SWEEP_INTERVAL_SECONDS,
+        settings.IDEMPOTENCY_SWEEP_BATCH_SIZE,
+        settings.IDEMPOTENCY_SWEEP_PAUSE_MS,
+    )
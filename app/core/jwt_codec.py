@@ -0,0 +1,116 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+
+import jwt
+
+
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HMACJWTCodec:
+    """
+    JWT-кодек для одного HMAC-алгоритма с заранее подготовленными
+    сегментом заголовка и ключом.
+
+    Выдаёт те же токены, что и `jwt.encode` (компактный JSON, заголовок
+    `{"alg":...,"typ":"JWT"}`), и принимает только токены с ровно таким
+    заголовком. Ошибки - исключения PyJWT, чтобы вызывающий код их не различал.
+    """
+
+    def __init__(self, key: str, algorithm: str):
+        self.algorithm = algorithm
+        header = json.dumps(
+            {"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True
+        )
+        self._header_segment = _b64encode(header.encode("utf-8")) + b"."
+        self._mac = hmac.new(key.encode("utf-8"), digestmod=_HMAC_DIGESTS[algorithm])
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return _b64encode(mac.digest())
+
+    def encode(self, claims: dict) -> str:
+        payload = json.dumps(claims, separators=(",", ":")).encode("utf-8")
+        signing_input = self._header_segment + _b64encode(payload)
+        return (signing_input + b"." + self._sign(signing_input)).decode("ascii")
+
+    def decode(self, token: str | bytes) -> dict:
+        if isinstance(token, str):
+            try:
+                token = token.encode("ascii")
+            except UnicodeEncodeError:
+                raise jwt.DecodeError("Invalid token type")
+        if not token.startswith(self._header_segment):
+            raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+
+        signing_input, _, signature = token.rpartition(b".")
+        payload_segment = signing_input[len(self._header_segment):]
+        if not payload_segment or b"." in payload_segment:
+            raise jwt.DecodeError("Not enough segments")
+        if not hmac.compare_digest(self._sign(signing_input), signature):
+            raise jwt.InvalidSignatureError("Signature verification failed")
+
+        try:
+            payload = json.loads(_b64decode(payload_segment))
+        except (binascii.Error, ValueError):
+            raise jwt.DecodeError("Invalid payload")
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.")
+            if exp <= now:
+                raise jwt.ExpiredSignatureError("Signature has expired")
+        nbf = payload.get("nbf")
+        if nbf is not None:
+            if not isinstance(nbf, (int, float)):
+                raise jwt.DecodeError("Not Before claim (nbf) must be an integer.")
+            if nbf > now:
+                raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+        iat = payload.get("iat")
+        if iat is not None:
+            if not isinstance(iat, (int, float)):
+                raise jwt.InvalidIssuedAtError("Issued At claim (iat) must be an integer.")
+            if iat > now:
+                raise jwt.ImmatureSignatureError("The token is not yet valid (iat)")
+        return payload
+
+
+class PyJWTCodec:
+    """Обычный путь через PyJWT для алгоритмов без специализированного кодека"""
+
+    def __init__(self, key: str, algorithm: str):
+        self.key = key
+        self.algorithm = algorithm
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self.key, algorithm=self.algorithm)
+
+    def decode(self, token: str | bytes) -> dict:
+        return jwt.decode(token, self.key, algorithms=[self.algorithm])
+
+
+def build_jwt_codec(key: str, algorithm: str) -> HMACJWTCodec | PyJWTCodec:
+    if algorithm in _HMAC_DIGESTS:
+        return HMACJWTCodec(key, algorithm)
+    return PyJWTCodec(key, algorithm)
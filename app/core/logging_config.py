@@ -1,6 +1,24 @@
 import logging
 from logging.handlers import RotatingFileHandler
 
+from app.core.timing import span
+
+
+class _TimedEmitMixin:
+    """Учитывает время записи лога в фазе `log` текущего запроса"""
+
+    def emit(self, record):
+        with span("log"):
+            super().emit(record)
+
+
+class TimedStreamHandler(_TimedEmitMixin, logging.StreamHandler):
+    pass
+
+
+class TimedRotatingFileHandler(_TimedEmitMixin, RotatingFileHandler):
+    pass
+
 
 def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
@@ -12,13 +30,14 @@ def setup_logger(name: str) -> logging.Logger:
         )
 
         # Обработчик для вывода в терминал
-        stream_handler = logging.StreamHandler()
+        stream_handler = TimedStreamHandler()
         stream_handler.setFormatter(formatter)
         logger.addHandler(stream_handler)
 
-        # Обработчик для записи в файл с ротацией
-        file_handler = RotatingFileHandler(
-            "app.log", maxBytes=10_000_000, backupCount=5
+        # Обработчик для записи в файл с ротацией; файл открывается
+        # при первой записи, а не при импорте модуля
+        file_handler = TimedRotatingFileHandler(
+            "app.log", maxBytes=10_000_000, backupCount=5, delay=True
         )
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
@@ -1,6 +1,4 @@
 import os
-from alembic import command
-from alembic.config import Config
 import anyio
 
 
@@ -8,6 +6,11 @@ async def run_migrations():
     """Применяет все миграции до head."""
 
     def _run():
+        # Alembic (вместе с mako) нужен только здесь, поэтому не импортируется
+        # вместе с app.main и не замедляет старт воркеров
+        from alembic import command
+        from alembic.config import Config
+
         # Базовая директория
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         alembic_ini = os.path.join(base_dir, "alembic.ini")
@@ -0,0 +1,120 @@
+"""
+Хелперы для миграций, не блокирующих запись в большие таблицы.
+
+Соглашения:
+- индексы на существующих таблицах создаются и удаляются только через
+  `create_index_concurrently` / `drop_index_concurrently`;
+- заполнение новых колонок - через `batched_backfill`, а не одним UPDATE;
+- каждая DDL-операция ждёт блокировку не дольше `lock_timeout`
+  (`MIGRATION_LOCK_TIMEOUT_MS` по умолчанию, см. alembic/env.py).
+"""
+import time
+from contextlib import contextmanager
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.config import settings
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+def _drop_invalid_index(index_name: str):
+    # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс,
+    # который IF NOT EXISTS молча пропустил бы
+    if op.get_context().as_sql:
+        # В offline-режиме (--sql) каталог не прочитать
+        return
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": index_name},
+    ).scalar()
+    if invalid:
+        logger.warning(f"Dropping invalid index {index_name}")
+        op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'))
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Sequence, **kw
+):
+    """CREATE INDEX CONCURRENTLY вне транзакции миграции"""
+    with op.get_context().autocommit_block():
+        _drop_invalid_index(index_name)
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str):
+    """DROP INDEX CONCURRENTLY вне транзакции миграции"""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+@contextmanager
+def lock_timeout(ms: int):
+    """Временно меняет lock_timeout для операций внутри блока"""
+    op.execute(sa.text(f"SET lock_timeout = '{int(ms)}ms'"))
+    try:
+        yield
+    finally:
+        op.execute(
+            sa.text(f"SET lock_timeout = '{int(settings.MIGRATION_LOCK_TIMEOUT_MS)}ms'")
+        )
+
+
+def batched_backfill(
+    table_name: str,
+    set_clause: str,
+    where_clause: str = "TRUE",
+    batch_size: int = 10_000,
+    pause: float = 0.0,
+    key: str = "id",
+) -> int:
+    """
+    Выполняет `UPDATE table_name SET set_clause WHERE where_clause` пачками
+    по диапазонам первичного ключа `key`. Каждая пачка коммитится отдельно,
+    поэтому строки блокируются ненадолго, а прогресс пишется в лог.
+    """
+    bind = op.get_bind()
+    total = 0
+    with op.get_context().autocommit_block():
+        low, high = bind.execute(
+            sa.text(f"SELECT min({key}), max({key}) FROM {table_name}")
+        ).one()
+        if low is None:
+            return 0
+
+        update = sa.text(
+            f"UPDATE {table_name} SET {set_clause} "
+            f"WHERE {key} >= :start AND {key} < :end AND ({where_clause})"
+        )
+        start = low
+        while start <= high:
+            end = start + batch_size
+            total += bind.execute(update, {"start": start, "end": end}).rowcount
+            scanned = min(end, high + 1) - low
+            logger.info(
+                f"Backfill {table_name}: {scanned}/{high - low + 1} keys scanned, "
+                f"{total} rows updated"
+            )
+            start = end
+            if pause:
+                time.sleep(pause)
+    return total
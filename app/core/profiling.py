@@ -0,0 +1,93 @@
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from app.core.config import settings
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+PROFILE_HEADER = "x-profile"
+
+# Одновременно профилируется не больше одного запроса на воркер
+_profiler_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """
+    Семплирующий профайлер потока event loop.
+
+    Фоновый поток с заданным интервалом снимает стек целевого потока и
+    копит его в формате collapsed stacks (`a;b;c count`), который понимают
+    flamegraph.pl, speedscope и inferno. Так как в потоке event loop
+    выполняются и другие корутины, в профиль попадают и соседние запросы.
+    """
+
+    def __init__(self, interval: float, thread_id: int | None = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items())
+
+
+def should_profile(headers) -> bool:
+    """Профилирование по привилегированному заголовку или случайной доле трафика"""
+    token = headers.get(PROFILE_HEADER)
+    if token and settings.PROFILING_TOKEN:
+        # Байты: compare_digest падает с TypeError на не-ASCII строках
+        return hmac.compare_digest(token.encode(), settings.PROFILING_TOKEN.encode())
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def start_profiler() -> SamplingProfiler | None:
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    profiler = SamplingProfiler(settings.PROFILING_INTERVAL_MS / 1000)
+    profiler.start()
+    return profiler
+
+
+def stop_profiler(profiler: SamplingProfiler, name: str) -> str:
+    """Останавливает профайлер и записывает результат в PROFILING_DIR"""
+    try:
+        profiler.stop()
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        path = os.path.join(
+            settings.PROFILING_DIR, f"{time.time_ns()}-{name}.folded"
+        )
+        with open(path, "w") as f:
+            f.write(profiler.collapsed())
+        logger.info(f"Profile written: {path}")
+        return path
+    finally:
+        _profiler_lock.release()
@@ -1,32 +1,107 @@
+import asyncio
 import jwt
 import bcrypt
-from datetime import datetime, timedelta
-from sqlalchemy.ext.asyncio import AsyncSession
+import struct
+import time
+from datetime import datetime, timedelta, timezone
 
 from app.core.config import settings
 from app.core.exceptions import InvalidTokenException
+from app.core.jwt_codec import build_jwt_codec
 from app.models.user import User
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import UserRepositoryProtocol
 from app.core.logging_config import setup_logger
+from app.core.shared_cache import SharedCache, get_shared_cache
+from app.core.timing import span
 
 logger = setup_logger(__name__)
 
+jwt_codec = build_jwt_codec(settings.SECRET_KEY, settings.ALGORITHM)
+
+# Записи разделяемого кэша: проверенный токен -> user_id,
+# user_id -> (created_at, username, email). Хеш пароля в кэш не попадает.
+_CACHED_SUBJECT = struct.Struct("<q")
+_CACHED_USER = struct.Struct("<dB")
+
+
+def _cache_token_subject(cache: SharedCache, token: str, token_type: str, payload: dict, user_id: int):
+    ttl = settings.SHARED_CACHE_TTL_SECONDS
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - time.time())
+    cache.set(token_type.encode(), token.encode(), _CACHED_SUBJECT.pack(user_id), ttl)
+
+
+def _get_cached_token_subject(cache: SharedCache, token: str, token_type: str) -> int | None:
+    value = cache.get(token_type.encode(), token.encode())
+    return None if value is None else _CACHED_SUBJECT.unpack(value)[0]
+
+
+def _cache_user(cache: SharedCache, user: User):
+    username = user.username.encode("utf-8")
+    value = (
+        _CACHED_USER.pack(user.created_at.timestamp(), len(username))
+        + username
+        + user.email.encode("utf-8")
+    )
+    cache.set(b"user", str(user.id).encode(), value, settings.SHARED_CACHE_TTL_SECONDS)
+
+
+def _get_cached_user(cache: SharedCache, user_id: int) -> User | None:
+    value = cache.get(b"user", str(user_id).encode())
+    if value is None:
+        return None
+    created_at, username_length = _CACHED_USER.unpack_from(value)
+    username_end = _CACHED_USER.size + username_length
+    return User(
+        id=user_id,
+        username=value[_CACHED_USER.size:username_end].decode("utf-8"),
+        email=value[username_end:].decode("utf-8"),
+        created_at=datetime.fromtimestamp(created_at, timezone.utc),
+    )
+
 
 class AuthService:
+    # Скользящее среднее длительности bcrypt.checkpw, секунды
+    password_check_seconds: float = 0.0
+
     @staticmethod
     def get_password_hash(password: str) -> str:
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        with span("bcrypt"):
+            return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+        started = time.perf_counter()
+        with span("bcrypt"):
+            result = bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+        elapsed = time.perf_counter() - started
+        average = AuthService.password_check_seconds
+        AuthService.password_check_seconds = (
+            elapsed if not average else 0.9 * average + 0.1 * elapsed
+        )
+        return result
+
+    @staticmethod
+    async def simulate_password_check():
+        """
+        Ждёт среднее время проверки пароля, не занимая CPU, чтобы вход
+        с несуществующим email не отвечал быстрее входа с неверным паролем
+        """
+        with span("bcrypt"):
+            await asyncio.sleep(AuthService.password_check_seconds)
 
     @staticmethod
     def create_token(data: dict, token_type: str, expires_delta: timedelta) -> str:
-        to_encode = data.copy()
-        expire = datetime.utcnow() + expires_delta
-        to_encode.update({"exp": expire, "type": token_type, "iat": datetime.utcnow()})
-        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        now = int(time.time())
+        to_encode = {
+            **data,
+            "exp": now + int(expires_delta.total_seconds()),
+            "type": token_type,
+            "iat": now,
+        }
+        with span("jwt"):
+            return jwt_codec.encode(to_encode)
 
     @staticmethod
     def create_access_token(data: dict) -> str:
@@ -43,11 +118,8 @@ class AuthService:
     @staticmethod
     def decode_token(token: str | bytes, expected_type: str = "access") -> dict:
         try:
-            if isinstance(token, str):
-                token = token.encode("utf-8")
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
+            with span("jwt"):
+                payload = jwt_codec.decode(token)
             token_type = payload.get("type")
             if token_type != expected_type:
                 logger.warning(
@@ -61,17 +133,30 @@ class AuthService:
 
     @staticmethod
     async def get_current_user(
-        token: str, session: AsyncSession, expected_type: str = "access"
+        token: str, repository: UserRepositoryProtocol, expected_type: str = "access"
     ) -> User:
-        payload = AuthService.decode_token(token, expected_type)
-        user_id = payload.get("sub")
+        # Разделяемый кэш хранит только поля, нужные ответам (без hashed_password)
+        cache = get_shared_cache()
+        user_id = None
+        if cache is not None:
+            user_id = _get_cached_token_subject(cache, token, expected_type)
         if user_id is None:
-            logger.warning("Missing 'sub' in token")
-            raise InvalidTokenException()
+            payload = AuthService.decode_token(token, expected_type)
+            user_id = payload.get("sub")
+            if user_id is None:
+                logger.warning("Missing 'sub' in token")
+                raise InvalidTokenException()
+
+            user_id = int(user_id)
+            if cache is not None:
+                _cache_token_subject(cache, token, expected_type, payload, user_id)
 
-        user_id = int(user_id)
-        user = await UserRepository.get_user_by_id(session, user_id)
+        if cache is not None and (user := _get_cached_user(cache, user_id)) is not None:
+            return user
+        user = await repository.get_user_by_id(user_id)
         if not user:
             logger.warning(f"User with id {user_id} not found")
             raise InvalidTokenException()
+        if cache is not None:
+            _cache_user(cache, user)
         return user
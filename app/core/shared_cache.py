@@ -0,0 +1,153 @@
+"""
+Кэш в разделяемой памяти, общий для всех воркеров uvicorn на хосте.
+
+Файл в /dev/shm отображается через mmap и разбит на слоты фиксированного
+размера. Слот выбирается по хешу ключа, при коллизии запись вытесняется.
+Формат слота:
+
+    seq: u64 | key: 16 байт blake2b | expires_at: f64 | length: u16 | crc32: u32 | value
+
+Чтение без блокировок (seqlock): нечётный `seq` означает, что слот
+пишется, а изменившийся за время копирования `seq` - что чтение рваное.
+В обоих случаях это промах. Запись берёт неблокирующий `lockf` на слот и
+пропускается, если слот уже пишет другой процесс. Значения - байты,
+упакованные вызывающим кодом через `struct`, а не сериализованные объекты.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from app.core.config import settings
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+# Меняется при любом изменении формата слота: новый формат - новый файл
+LAYOUT_VERSION = 1
+
+_SLOT_HEADER = struct.Struct("<Q16sdHI")
+_SEQ = struct.Struct("<Q")
+
+
+class SharedCache:
+    def __init__(self, path: str, slots: int, slot_size: int, secret: str):
+        if slot_size <= _SLOT_HEADER.size:
+            raise ValueError(f"slot_size must be greater than {_SLOT_HEADER.size}")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.hits = 0
+        self.misses = 0
+        self.skipped_writes = 0
+        self._hash_key = hashlib.blake2b(secret.encode("utf-8"), digest_size=32).digest()
+
+        size = slots * slot_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Размер входит в имя файла, поэтому файл только растёт от нуля до size
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+
+    def _locate(self, namespace: bytes, key: bytes) -> tuple[bytes, int]:
+        digest = hashlib.blake2b(
+            namespace + b"\0" + key, digest_size=16, key=self._hash_key
+        ).digest()
+        return digest, int.from_bytes(digest[:8], "little") % self.slots * self.slot_size
+
+    def get(self, namespace: bytes, key: bytes) -> bytes | None:
+        digest, offset = self._locate(namespace, key)
+        slot = self._mm[offset:offset + self.slot_size]
+        seq, slot_digest, expires_at, length, checksum = _SLOT_HEADER.unpack_from(slot)
+        if (
+            seq & 1
+            or _SEQ.unpack_from(self._mm, offset)[0] != seq
+            or slot_digest != digest
+            or expires_at <= time.time()
+            or length > self.slot_size - _SLOT_HEADER.size
+        ):
+            self.misses += 1
+            return None
+        value = slot[_SLOT_HEADER.size:_SLOT_HEADER.size + length]
+        if zlib.crc32(value) != checksum:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, namespace: bytes, key: bytes, value: bytes, ttl: float) -> bool:
+        if ttl <= 0 or len(value) > self.slot_size - _SLOT_HEADER.size:
+            return False
+        digest, offset = self._locate(namespace, key)
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, self.slot_size, offset)
+        except OSError:
+            # Слот пишет другой воркер - кэш не обязан сохранить каждое значение
+            self.skipped_writes += 1
+            return False
+        try:
+            seq = _SEQ.unpack_from(self._mm, offset)[0]
+            # Сначала нечётный seq, потом данные: читатель увидит незавершённую запись
+            _SEQ.pack_into(self._mm, offset, seq + 1)
+            _SLOT_HEADER.pack_into(
+                self._mm,
+                offset,
+                seq + 1,
+                digest,
+                time.time() + ttl,
+                len(value),
+                zlib.crc32(value),
+            )
+            self._mm[offset + _SLOT_HEADER.size:offset + _SLOT_HEADER.size + len(value)] = value
+            _SEQ.pack_into(self._mm, offset, seq + 2)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.slot_size, offset)
+        return True
+
+    def close(self):
+        self._mm.close()
+        os.close(self._fd)
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "slots": self.slots,
+            "slot_size": self.slot_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped_writes": self.skipped_writes,
+        }
+
+
+_shared_cache: SharedCache | None = None
+
+
+def get_shared_cache() -> SharedCache | None:
+    """Открывает кэш при первом обращении; None, если кэш выключен"""
+    global _shared_cache
+    if _shared_cache is None and settings.SHARED_CACHE_ENABLED:
+        if fcntl is None:
+            logger.warning("Shared cache requires fcntl, disabled on this platform")
+            settings.SHARED_CACHE_ENABLED = False
+            return None
+        path = os.path.join(
+            settings.SHARED_CACHE_DIR,
+            f"fastapi_jwt_cache.v{LAYOUT_VERSION}."
+            f"{settings.SHARED_CACHE_SLOTS}x{settings.SHARED_CACHE_SLOT_SIZE}",
+        )
+        _shared_cache = SharedCache(
+            path,
+            settings.SHARED_CACHE_SLOTS,
+            settings.SHARED_CACHE_SLOT_SIZE,
+            settings.SECRET_KEY,
+        )
+        logger.info(f"Shared cache opened: {path}")
+    return _shared_cache
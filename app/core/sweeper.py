@@ -0,0 +1,64 @@
+"""
+Периодическая очистка истёкших записей (refresh-токены, ключи Idempotency-Key).
+
+Записи удаляются небольшими пачками, каждая в своей транзакции, с паузой
+между пачками, чтобы очистка не держала блокировки и не забивала пул.
+"""
+import asyncio
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import RepositoryFactory
+from app.core.logging_config import setup_logger
+from app.repositories.base import ExpiringRepositoryProtocol
+
+
+logger = setup_logger(__name__)
+
+
+async def delete_expired_batch(session: AsyncSession, model, batch_size: int) -> int:
+    """Удаляет не больше `batch_size` строк `model` с истёкшим expires_at"""
+    (key,) = model.__table__.primary_key.columns
+    # SKIP LOCKED: воркеры, чистящие таблицу одновременно, не ждут друг друга
+    expired = (
+        select(key)
+        .where(model.expires_at < func.now())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(delete(model).where(key.in_(expired.scalar_subquery())))
+    await session.commit()
+    return result.rowcount
+
+
+async def sweep_expired(
+    repository: ExpiringRepositoryProtocol, batch_size: int, pause: float
+) -> int:
+    """Удаляет все истёкшие записи пачками по `batch_size`, возвращает их число"""
+    total = 0
+    while True:
+        deleted = await repository.delete_expired(batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def run_sweeper(
+    name: str,
+    repository_factory: RepositoryFactory[ExpiringRepositoryProtocol],
+    interval: float,
+    batch_size: int,
+    pause_ms: int,
+):
+    """Фоновая задача: раз в `interval` секунд удаляет истёкшие записи"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with repository_factory() as repository:
+                deleted = await sweep_expired(repository, batch_size, pause_ms / 1000)
+            if deleted:
+                logger.info(f"Expired {name} deleted: {deleted}")
+        except Exception as e:
+            logger.error(f"Sweep of expired {name} failed: {e}")
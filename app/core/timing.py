@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class RequestTimings:
+    """Накопитель длительностей фаз одного запроса"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.spans: dict[str, float] = {}
+
+    def add(self, name: str, duration: float):
+        self.spans[name] = self.spans.get(name, 0.0) + duration
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def server_timing_header(self) -> str:
+        parts = [f"{name};dur={duration * 1000:.2f}" for name, duration in self.spans.items()]
+        parts.append(f"total;dur={self.total_ms():.2f}")
+        return ", ".join(parts)
+
+    def log_fields(self) -> dict[str, float]:
+        fields = {
+            f"{name}_ms": round(duration * 1000, 2)
+            for name, duration in self.spans.items()
+        }
+        fields["total_ms"] = round(self.total_ms(), 2)
+        return fields
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> RequestTimings:
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def get_request_timings() -> RequestTimings | None:
+    return _current_timings.get()
+
+
+@contextmanager
+def span(name: str):
+    """Замер фазы запроса. Вне запроса ничего не записывает."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started_at)
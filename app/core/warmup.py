@@ -0,0 +1,120 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import anyio
+
+from app.api.v1.schemas import TokenResponse, UserResponse
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.logging_config import setup_logger
+from app.core.security import AuthService
+from app.models.user import User
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.user_repository import UserRepository
+
+
+logger = setup_logger(__name__)
+
+
+class ReadinessState:
+    """Готовность воркера принимать трафик"""
+
+    def __init__(self):
+        self.ready = False
+        # Причина ошибки только в логе, наружу отдаётся лишь факт неудачи
+        self.failed = False
+
+    def mark_ready(self):
+        self.ready = True
+        self.failed = False
+
+    def mark_not_ready(self, failed: bool = False):
+        self.ready = False
+        self.failed = failed
+
+
+readiness = ReadinessState()
+
+
+async def warm_up_database(connections: int):
+    """
+    Открывает `connections` соединений пула одновременно и на каждом
+    выполняет горячие запросы, чтобы asyncpg заранее выполнил интроспекцию
+    типов и подготовил statements.
+    """
+    if connections <= 0:
+        return
+    barrier = asyncio.Barrier(connections)
+
+    async def _prime():
+        async with async_session_factory() as session:
+            repository = UserRepository(session)
+            await repository.get_user_by_email("warmup@example.invalid")
+            await repository.get_user_by_id(0)
+            await RefreshTokenRepository(session).get(uuid.uuid4())
+            # Держим соединение, пока остальные не откроют свои
+            await barrier.wait()
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(connections):
+            tg.start_soon(_prime)
+
+
+def warm_up_auth():
+    """Прогоняет bcrypt, JWT и сериализацию схем ответов"""
+    hashed_password = AuthService.get_password_hash("Warmup123")
+    AuthService.verify_password("Warmup123", hashed_password)
+
+    access_token = AuthService.create_access_token({"sub": "0"})
+    AuthService.decode_token(access_token, "access")
+    refresh_token = AuthService.create_refresh_token({"sub": "0"})
+    AuthService.decode_token(refresh_token, "refresh")
+
+    user = User(
+        id=0,
+        username="warmup",
+        email="warmup@example.com",
+        hashed_password=hashed_password,
+        created_at=datetime.now(timezone.utc),
+    )
+    UserResponse.model_validate(user).model_dump_json()
+    TokenResponse(access_token=access_token).model_dump_json()
+
+
+async def warm_up():
+    logger.info("Warming up worker")
+    async with anyio.create_task_group() as tg:
+        connections = min(
+            settings.WARMUP_POOL_CONNECTIONS,
+            settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        )
+        if settings.REPOSITORY_BACKEND != "memory":
+            tg.start_soon(warm_up_database, connections)
+        tg.start_soon(anyio.to_thread.run_sync, warm_up_auth)
+    logger.info("Warm-up complete")
+
+
+def _causes(error: BaseException) -> list[BaseException]:
+    """Исключения внутри (вложенных) ExceptionGroup из task group"""
+    if isinstance(error, BaseExceptionGroup):
+        return [cause for sub in error.exceptions for cause in _causes(sub)]
+    return [error]
+
+
+async def run_warmup():
+    """Прогревает воркер, повторяя попытки, пока прогрев не пройдёт успешно"""
+    while True:
+        try:
+            await warm_up()
+        except Exception as e:
+            readiness.mark_not_ready(failed=True)
+            causes = "; ".join(f"{type(cause).__name__}: {cause}" for cause in _causes(e))
+            logger.error(
+                f"Warm-up failed: {causes}. Retrying in {settings.WARMUP_RETRY_SECONDS}s",
+                exc_info=e,
+            )
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+            continue
+        readiness.mark_ready()
+        return
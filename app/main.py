@@ -1,12 +1,38 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
+import asyncio
+import anyio
 
+from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.core.dependencies import get_refresh_token_repository, use_in_memory_repositories
+from app.core.email_filter import run_email_filter_build
+from app.core.idempotency import (
+    postgres_idempotency_repository,
+    register_idempotency,
+    run_idempotency_sweeper,
+)
 from app.core.migrations import run_migrations
 from app.api.v1.auth import router as auth_router
+from app.api.v1.admin import router as admin_router
+from app.api.v1.users import router as users_router
+from app.api.health import router as health_router
+from app.core.admission import AdmissionControlMiddleware
 from app.core.exceptions import AppException, DatabaseException
 from app.core.logging_config import setup_logger
+from app.core.profiling import should_profile, start_profiler, stop_profiler
+from app.core.timing import start_request_timings
+from app.core.warmup import readiness, run_warmup
+from app.services.audit_service import (
+    login_audit,
+    memory_audit_repository,
+    postgres_audit_repository,
+)
+from app.services.token_service import (
+    postgres_refresh_token_repository,
+    run_refresh_token_sweeper,
+)
 
 
 logger = setup_logger(__name__)
@@ -16,14 +42,40 @@ logger = setup_logger(__name__)
 async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения"""
     logger.info("Starting app")
+    background_tasks = []
     try:
-        await run_migrations()
-        await init_db()
+        if settings.REPOSITORY_BACKEND != "memory":
+            await run_migrations()
+            await init_db()
+            refresh_token_repository_factory = postgres_refresh_token_repository
+            login_audit.start(postgres_audit_repository)
+            # Ключи Idempotency-Key общие для всех воркеров только в Postgres
+            register_idempotency.repository_factory = postgres_idempotency_repository
+            if settings.EMAIL_FILTER_ENABLED:
+                background_tasks.append(asyncio.create_task(run_email_filter_build()))
+        else:
+            # Тот же экземпляр, что отдаёт зависимость, иначе чистилось бы не то хранилище
+            refresh_token_repository = app.dependency_overrides[get_refresh_token_repository]()
+            refresh_token_repository_factory = lambda: nullcontext(refresh_token_repository)
+            login_audit.start(memory_audit_repository)
+        background_tasks.append(
+            asyncio.create_task(run_refresh_token_sweeper(refresh_token_repository_factory))
+        )
+        background_tasks.append(
+            asyncio.create_task(run_idempotency_sweeper(register_idempotency.repository_factory))
+        )
+        # Прогрев идёт в фоне: /health/live уже отвечает, /health/ready - после прогрева
+        background_tasks.append(asyncio.create_task(run_warmup()))
         yield
     except Exception as e:
         logger.error(f"Error in lifespan: {e}")
     finally:
         logger.info("Stopping app")
+        readiness.mark_not_ready()
+        for task in background_tasks:
+            task.cancel()
+        # Сбрасываем накопленный журнал входов до закрытия пула
+        await login_audit.stop()
         await close_db()
 
 
@@ -32,7 +84,37 @@ app = FastAPI(
 )
 
 
+if settings.REPOSITORY_BACKEND == "memory":
+    use_in_memory_repositories(app)
+
 app.include_router(auth_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(users_router, prefix="/api/v1")
+app.include_router(health_router)
+
+app.add_middleware(AdmissionControlMiddleware)
+
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    """Server-Timing по фазам запроса и профилирование по запросу"""
+    timings = start_request_timings()
+    profiler = start_profiler() if should_profile(request.headers) else None
+    try:
+        response = await call_next(request)
+    finally:
+        if profiler is not None:
+            profile_name = request.url.path.strip("/").replace("/", "_") or "root"
+            await anyio.to_thread.run_sync(stop_profiler, profiler, profile_name)
+
+    response.headers["Server-Timing"] = timings.server_timing_header()
+    fields = timings.log_fields()
+    logger.info(
+        f"{request.method} {request.url.path} status={response.status_code} "
+        + " ".join(f"{key}={value}" for key, value in fields.items()),
+        extra={"timings": fields},
+    )
+    return response
 
 
 @app.exception_handler(AppException)
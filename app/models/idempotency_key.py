@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, JSON, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # HMAC тела запроса: повтор ключа с другим телом отклоняется
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    # NULL, пока исходный запрос выполняется
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, index=True
+    )
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+class LoginEvent(Base):
+    __tablename__ = "login_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    event_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    ip_address: Mapped[str | None] = mapped_column(String(45), nullable=True)
+    user_agent: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Время события, а не вставки: запись идёт пачками с задержкой
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
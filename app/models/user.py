@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, TIMESTAMP, func
+from sqlalchemy import Index, Integer, String, TIMESTAMP, func, text
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import Mapped, DeclarativeBase, mapped_column
 from datetime import datetime
@@ -10,9 +10,26 @@ class Base(DeclarativeBase, AsyncAttrs):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Имена уникальны без учёта регистра: "Alice" и "alice" - одно имя
+        Index("ix_users_username_lower_unique", text("lower(username)"), unique=True),
+        # Поиск по префиксу с keyset-пагинацией; username в INCLUDE для index-only scan
+        Index(
+            "ix_users_username_prefix",
+            text('lower(username) COLLATE "C"'),
+            "id",
+            postgresql_include=["username"],
+        ),
+        # Нечёткий поиск (pg_trgm), GiST отдаёт ближайшие по <-> без сортировки всех совпадений
+        Index(
+            "ix_users_username_trgm",
+            text("lower(username) gist_trgm_ops"),
+            postgresql_using="gist",
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    username: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    username: Mapped[str] = mapped_column(String(50), nullable=False)
     email: Mapped[str] = mapped_column(
         String(255), unique=True, nullable=False, index=True
     )
@@ -20,3 +37,7 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
     )
+    # Обновляется асинхронно пачками из журнала входов (app/services/audit_service.py)
+    last_login_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy import bindparam, insert, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.login_event import LoginEvent
+from app.models.user import User
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+users_table = User.__table__
+
+
+class AuditRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def write_batch(
+        self, events: list[dict], last_logins: dict[int, datetime]
+    ) -> None:
+        if events:
+            # executemany превращается в многострочный INSERT ... VALUES
+            await self.session.execute(insert(LoginEvent), events)
+        if last_logins:
+            # Сортировка по id: одинаковый порядок блокировок строк во всех воркерах
+            await self.session.execute(
+                update(users_table)
+                .where(
+                    users_table.c.id == bindparam("b_user_id"),
+                    or_(
+                        users_table.c.last_login_at.is_(None),
+                        users_table.c.last_login_at < bindparam("b_last_login_at"),
+                    ),
+                )
+                .values(last_login_at=bindparam("b_last_login_at")),
+                [
+                    {"b_user_id": user_id, "b_last_login_at": last_login_at}
+                    for user_id, last_login_at in sorted(last_logins.items())
+                ],
+            )
+        await self.session.commit()
@@ -0,0 +1,109 @@
+from datetime import datetime
+from typing import AsyncIterator, Protocol, Sequence
+from uuid import UUID
+
+from app.models.idempotency_key import IdempotencyKey
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+class UserRepositoryProtocol(Protocol):
+    """Интерфейс хранилища пользователей, внедряемый через зависимости FastAPI"""
+
+    async def get_user_by_id(self, user_id: int) -> User | None: ...
+
+    async def get_user_by_email(self, email: str) -> User | None: ...
+
+    async def create_user(
+        self, username: str, email: str, hashed_password: str
+    ) -> User: ...
+
+    async def list_users(self, after_id: int | None, limit: int) -> list[User]: ...
+
+    def stream_users(self, chunk_size: int) -> AsyncIterator[Sequence[dict]]:
+        """Все пользователи по возрастанию id пачками по `chunk_size` строк"""
+        ...
+
+    async def list_emails(self, after_id: int, limit: int) -> list[tuple[int, str]]:
+        """Пары (id, email) с id > after_id по возрастанию id"""
+        ...
+
+    async def search_usernames(
+        self, prefix: str, after: tuple[str, int] | None, limit: int
+    ) -> list[tuple[int, str]]:
+        """
+        Пары (id, username), где lower(username) начинается с lower(prefix),
+        по возрастанию (lower(username), id) с побайтовым сравнением строк.
+        `after` - ключ (username, id) последней строки предыдущей страницы.
+        """
+        ...
+
+    async def search_usernames_fuzzy(self, query: str, limit: int) -> list[tuple[int, str]]:
+        """Пары (id, username), похожие на query по триграммам, от самых похожих"""
+        ...
+
+    async def username_exists(self, username: str) -> bool: ...
+
+
+class RefreshTokenRepositoryProtocol(Protocol):
+    """Хранилище выданных refresh-токенов"""
+
+    async def create(
+        self, jti: UUID, family_id: UUID, user_id: int, expires_at: datetime
+    ) -> None: ...
+
+    async def rotate(self, jti: UUID, new_jti: UUID, expires_at: datetime) -> int | None:
+        """
+        Атомарно отзывает активный токен `jti` и выдаёт `new_jti` в том же
+        семействе. Возвращает user_id или None, если токен не активен.
+        """
+        ...
+
+    async def get(self, jti: UUID) -> RefreshToken | None: ...
+
+    async def revoke_family(self, family_id: UUID) -> None: ...
+
+    async def delete_expired(self, batch_size: int) -> int:
+        """Удаляет не больше `batch_size` истёкших токенов, возвращает их число"""
+        ...
+
+
+class ExpiringRepositoryProtocol(Protocol):
+    """Хранилище записей со сроком жизни, которое чистит app/core/sweeper.py"""
+
+    async def delete_expired(self, batch_size: int) -> int:
+        """Удаляет не больше `batch_size` истёкших записей, возвращает их число"""
+        ...
+
+
+class AuditRepositoryProtocol(Protocol):
+    """Приёмник пачек событий входа"""
+
+    async def write_batch(
+        self, events: list[dict], last_logins: dict[int, datetime]
+    ) -> None:
+        """Вставляет события и сдвигает users.last_login_at вперёд"""
+        ...
+
+
+class IdempotencyRepositoryProtocol(Protocol):
+    """Ответы, сохранённые по заголовку Idempotency-Key"""
+
+    async def claim(
+        self, key: str, fingerprint: str, expires_at: datetime, stale_before: datetime
+    ) -> bool:
+        """
+        Занимает ключ под выполнение запроса. Удаётся, если ключа нет,
+        он истёк или его выполнение не завершилось и начато раньше `stale_before`.
+        """
+        ...
+
+    async def get(self, key: str) -> IdempotencyKey | None: ...
+
+    async def complete(self, key: str, status_code: int, response: dict) -> None: ...
+
+    async def release(self, key: str) -> None:
+        """Снимает незавершённый захват, чтобы повтор выполнился заново"""
+        ...
+
+    async def delete_expired(self, batch_size: int) -> int: ...
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency_key import IdempotencyKey
+from app.core.sweeper import delete_expired_batch
+from app.core.timing import span
+
+
+class IdempotencyRepository:
+    """
+    Ключи Idempotency-Key в Postgres, общие для всех воркеров и хостов.
+    Каждый метод завершает свою транзакцию, чтобы ожидающий повтор не
+    держал соединение пула между опросами.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def claim(
+        self, key: str, fingerprint: str, expires_at: datetime, stale_before: datetime
+    ) -> bool:
+        # Один запрос: вставка нового ключа или захват истёкшего/зависшего
+        table = IdempotencyKey.__table__
+        statement = (
+            insert(IdempotencyKey)
+            .values(
+                key=key,
+                fingerprint=fingerprint,
+                status_code=None,
+                response=None,
+                created_at=func.now(),
+                expires_at=expires_at,
+            )
+            .on_conflict_do_update(
+                index_elements=[IdempotencyKey.key],
+                set_={
+                    "fingerprint": fingerprint,
+                    "status_code": None,
+                    "response": None,
+                    "created_at": func.now(),
+                    "expires_at": expires_at,
+                },
+                where=or_(
+                    table.c.expires_at < func.now(),
+                    (table.c.status_code.is_(None)) & (table.c.created_at < stale_before),
+                ),
+            )
+            .returning(IdempotencyKey.key)
+        )
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(statement)
+            claimed = result.scalar_one_or_none() is not None
+            await self.session.commit()
+        return claimed
+
+    async def get(self, key: str) -> IdempotencyKey | None:
+        with span("db_query"):
+            result = await self.session.execute(select(IdempotencyKey).filter_by(key=key))
+            record = result.scalars().first()
+            await self.session.commit()
+        return record
+
+    async def complete(self, key: str, status_code: int, response: dict) -> None:
+        with span("db_query"):
+            await self.session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(status_code=status_code, response=response)
+            )
+            await self.session.commit()
+
+    async def release(self, key: str) -> None:
+        with span("db_query"):
+            await self.session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+                )
+            )
+            await self.session.commit()
+
+    async def delete_expired(self, batch_size: int) -> int:
+        return await delete_expired_batch(self.session, IdempotencyKey, batch_size)
@@ -0,0 +1,24 @@
+from collections import deque
+from datetime import datetime
+
+
+class InMemoryAuditRepository:
+    """
+    Журнал входов в памяти процесса. Хранит только последние `max_events`
+    событий, чтобы долгие нагрузочные прогоны не расходовали память без предела.
+    """
+
+    def __init__(self, max_events: int = 10_000):
+        self.events: deque[dict] = deque(maxlen=max_events)
+        self.written = 0
+        self.last_logins: dict[int, datetime] = {}
+
+    async def write_batch(
+        self, events: list[dict], last_logins: dict[int, datetime]
+    ) -> None:
+        self.events.extend(events)
+        self.written += len(events)
+        for user_id, last_login_at in last_logins.items():
+            previous = self.last_logins.get(user_id)
+            if previous is None or previous < last_login_at:
+                self.last_logins[user_id] = last_login_at
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import islice
+
+from app.models.idempotency_key import IdempotencyKey
+
+
+class InMemoryIdempotencyRepository:
+    """
+    Ключи Idempotency-Key в памяти процесса для in-memory бэкенда.
+    Хранит не больше `max_keys` ключей, вытесняя самые старые.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._records: OrderedDict[str, IdempotencyKey] = OrderedDict()
+
+    async def claim(
+        self, key: str, fingerprint: str, expires_at: datetime, stale_before: datetime
+    ) -> bool:
+        now = datetime.now(timezone.utc)
+        record = self._records.get(key)
+        if record is not None and record.expires_at >= now and (
+            record.status_code is not None or record.created_at >= stale_before
+        ):
+            return False
+        self._records[key] = IdempotencyKey(
+            key=key,
+            fingerprint=fingerprint,
+            status_code=None,
+            response=None,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_keys:
+            self._records.popitem(last=False)
+        return True
+
+    async def get(self, key: str) -> IdempotencyKey | None:
+        return self._records.get(key)
+
+    async def complete(self, key: str, status_code: int, response: dict) -> None:
+        record = self._records.get(key)
+        if record is not None:
+            record.status_code = status_code
+            record.response = response
+
+    async def release(self, key: str) -> None:
+        record = self._records.get(key)
+        if record is not None and record.status_code is None:
+            del self._records[key]
+
+    async def delete_expired(self, batch_size: int) -> int:
+        now = datetime.now(timezone.utc)
+        expired = list(
+            islice(
+                (key for key, record in self._records.items() if record.expires_at < now),
+                batch_size,
+            )
+        )
+        for key in expired:
+            del self._records[key]
+        return len(expired)
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from itertools import islice
+from uuid import UUID
+
+from app.models.refresh_token import RefreshToken
+
+
+class InMemoryRefreshTokenRepository:
+    """Хранилище refresh-токенов в памяти процесса с индексом по семействам"""
+
+    def __init__(self):
+        self._tokens: dict[UUID, RefreshToken] = {}
+        self._families: dict[UUID, set[UUID]] = {}
+
+    async def create(
+        self, jti: UUID, family_id: UUID, user_id: int, expires_at: datetime
+    ) -> None:
+        self._tokens[jti] = RefreshToken(
+            jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at
+        )
+        self._families.setdefault(family_id, set()).add(jti)
+
+    async def rotate(self, jti: UUID, new_jti: UUID, expires_at: datetime) -> int | None:
+        token = self._tokens.get(jti)
+        now = datetime.now(timezone.utc)
+        if token is None or token.revoked_at is not None or token.expires_at <= now:
+            return None
+        token.revoked_at = now
+        await self.create(new_jti, token.family_id, token.user_id, expires_at)
+        return token.user_id
+
+    async def get(self, jti: UUID) -> RefreshToken | None:
+        return self._tokens.get(jti)
+
+    async def revoke_family(self, family_id: UUID) -> None:
+        now = datetime.now(timezone.utc)
+        for jti in self._families.get(family_id, ()):
+            token = self._tokens[jti]
+            if token.revoked_at is None:
+                token.revoked_at = now
+
+    async def delete_expired(self, batch_size: int) -> int:
+        now = datetime.now(timezone.utc)
+        expired = list(
+            islice(
+                (token for token in self._tokens.values() if token.expires_at < now),
+                batch_size,
+            )
+        )
+        for token in expired:
+            del self._tokens[token.jti]
+            family = self._families[token.family_id]
+            family.discard(token.jti)
+            if not family:
+                del self._families[token.family_id]
+        return len(expired)
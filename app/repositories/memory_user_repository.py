@@ -0,0 +1,130 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from typing import AsyncIterator, Sequence
+
+from app.models.user import User
+from app.core.exceptions import DatabaseException, UserAlreadyExistsException
+
+
+def _username_key(username: str) -> bytes:
+    # Как lower(username) COLLATE "C": побайтовое сравнение UTF-8
+    return username.lower().encode("utf-8")
+
+
+def _trigrams(value: str) -> set[str]:
+    # Упрощённый pg_trgm: слово дополняется двумя пробелами слева и одним справа
+    padded = f"  {value.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Порог оператора % в pg_trgm по умолчанию (pg_trgm.similarity_threshold)
+_SIMILARITY_THRESHOLD = 0.3
+
+
+class InMemoryUserRepository:
+    """
+    Хранилище пользователей в памяти процесса с индексами по id и email.
+
+    Повторяет поведение UserRepository, включая уникальность email, и
+    позволяет нагружать HTTP- и auth-слои без Postgres.
+    """
+
+    def __init__(self):
+        self._users_by_id: dict[int, User] = {}
+        self._user_ids_by_email: dict[str, int] = {}
+        # id выдаются по возрастанию, поэтому список всегда отсортирован
+        self._user_ids: list[int] = []
+        # (lower(username), id) по возрастанию для поиска по префиксу
+        self._username_keys: list[tuple[bytes, int]] = []
+        self._next_id = 1
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        return self._users_by_id.get(user_id)
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        user_id = self._user_ids_by_email.get(email)
+        if user_id is None:
+            return None
+        return self._users_by_id[user_id]
+
+    async def list_users(self, after_id: int | None, limit: int) -> list[User]:
+        start = 0 if after_id is None else bisect_right(self._user_ids, after_id)
+        return [
+            self._users_by_id[user_id]
+            for user_id in self._user_ids[start:start + limit]
+        ]
+
+    async def stream_users(self, chunk_size: int) -> AsyncIterator[Sequence[dict]]:
+        for start in range(0, len(self._user_ids), chunk_size):
+            yield [
+                {
+                    "id": user.id,
+                    "username": user.username,
+                    "email": user.email,
+                    "created_at": user.created_at,
+                }
+                for user in (
+                    self._users_by_id[user_id]
+                    for user_id in self._user_ids[start:start + chunk_size]
+                )
+            ]
+
+    async def list_emails(self, after_id: int, limit: int) -> list[tuple[int, str]]:
+        start = bisect_right(self._user_ids, after_id)
+        return [
+            (user_id, self._users_by_id[user_id].email)
+            for user_id in self._user_ids[start:start + limit]
+        ]
+
+    async def search_usernames(
+        self, prefix: str, after: tuple[str, int] | None, limit: int
+    ) -> list[tuple[int, str]]:
+        key_prefix = _username_key(prefix)
+        start = (key_prefix, -1) if after is None else (_username_key(after[0]), after[1])
+        index = bisect_right(self._username_keys, start)
+        result = []
+        for key, user_id in self._username_keys[index:]:
+            if len(result) >= limit or not key.startswith(key_prefix):
+                break
+            result.append((user_id, self._users_by_id[user_id].username))
+        return result
+
+    async def search_usernames_fuzzy(self, query: str, limit: int) -> list[tuple[int, str]]:
+        query_trigrams = _trigrams(query)
+        matches = []
+        for user in self._users_by_id.values():
+            trigrams = _trigrams(user.username)
+            similarity = len(trigrams & query_trigrams) / len(trigrams | query_trigrams)
+            if similarity >= _SIMILARITY_THRESHOLD:
+                matches.append((1 - similarity, user.id, user.username))
+        matches.sort()
+        return [(user_id, username) for _, user_id, username in matches[:limit]]
+
+    async def username_exists(self, username: str) -> bool:
+        key = _username_key(username)
+        index = bisect_left(self._username_keys, (key, -1))
+        return index < len(self._username_keys) and self._username_keys[index][0] == key
+
+    async def create_user(
+        self, username: str, email: str, hashed_password: str
+    ) -> User:
+        if email in self._user_ids_by_email:
+            raise DatabaseException(
+                internal_detail=f'duplicate key value violates unique constraint "ix_users_email": {email}'
+            )
+        # Как ix_users_username_lower_unique в Postgres
+        if await self.username_exists(username):
+            raise UserAlreadyExistsException(detail=f"Username {username} already taken")
+        user = User(
+            id=self._next_id,
+            username=username,
+            email=email,
+            hashed_password=hashed_password,
+            created_at=datetime.now(timezone.utc),
+        )
+        self._next_id += 1
+        self._users_by_id[user.id] = user
+        self._user_ids_by_email[email] = user.id
+        self._user_ids.append(user.id)
+        insort(self._username_keys, (_username_key(username), user.id))
+        return user
@@ -0,0 +1,88 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func, insert, literal, select, update, Uuid, TIMESTAMP
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.refresh_token import RefreshToken
+from app.core.sweeper import delete_expired_batch
+from app.core.timing import span
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+class RefreshTokenRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(
+        self, jti: UUID, family_id: UUID, user_id: int, expires_at: datetime
+    ) -> None:
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            await self.session.execute(
+                insert(RefreshToken).values(
+                    jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at
+                )
+            )
+            await self.session.commit()
+
+    async def rotate(self, jti: UUID, new_jti: UUID, expires_at: datetime) -> int | None:
+        # Отзыв старого и вставка нового токена одним запросом:
+        # WITH rotated AS (UPDATE ... RETURNING) INSERT ... SELECT FROM rotated
+        rotated = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > func.now(),
+            )
+            .values(revoked_at=func.now())
+            .returning(RefreshToken.family_id, RefreshToken.user_id)
+            .cte("rotated")
+        )
+        query = (
+            insert(RefreshToken)
+            .from_select(
+                ["jti", "family_id", "user_id", "expires_at"],
+                select(
+                    literal(new_jti, Uuid),
+                    rotated.c.family_id,
+                    rotated.c.user_id,
+                    literal(expires_at, TIMESTAMP(timezone=True)),
+                ),
+            )
+            .returning(RefreshToken.user_id)
+        )
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(query)
+            user_id = result.scalar_one_or_none()
+            await self.session.commit()
+        return user_id
+
+    async def get(self, jti: UUID) -> RefreshToken | None:
+        with span("db_query"):
+            result = await self.session.execute(
+                select(RefreshToken).filter_by(jti=jti)
+            )
+        return result.scalars().first()
+
+    async def revoke_family(self, family_id: UUID) -> None:
+        with span("db_query"):
+            await self.session.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.family_id == family_id,
+                    RefreshToken.revoked_at.is_(None),
+                )
+                .values(revoked_at=func.now())
+            )
+            await self.session.commit()
+
+    async def delete_expired(self, batch_size: int) -> int:
+        return await delete_expired_batch(self.session, RefreshToken, batch_size)
@@ -1,35 +1,141 @@
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import exists, func, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 
 from app.models.user import User
-from app.core.exceptions import DatabaseException
+from app.core.exceptions import DatabaseException, UserAlreadyExistsException
+from app.core.timing import span
 from app.core.logging_config import setup_logger
 
 
 logger = setup_logger(__name__)
 
+# Ключи индексов ix_users_username_prefix и ix_users_username_trgm:
+# запросы должны повторять выражения индексов дословно
+_username_key = func.lower(User.username).collate("C")
+_username_trgm_key = func.lower(User.username)
+# Больше любого символа в побайтовом (C) порядке UTF-8
+_MAX_CHAR = "\U0010ffff"
+
 
 class UserRepository:
-    @staticmethod
-    async def get_user_by_id(session: AsyncSession, user_id: int) -> User | None:
-        result = await session.execute(select(User).filter_by(id=user_id))
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(select(User).filter_by(id=user_id))
         return result.scalars().first()
 
-    @staticmethod
-    async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
-        result = await session.execute(select(User).filter_by(email=email))
+    async def get_user_by_email(self, email: str) -> User | None:
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(select(User).filter_by(email=email))
         return result.scalars().first()
 
-    @staticmethod
+    async def list_users(self, after_id: int | None, limit: int) -> list[User]:
+        # Keyset-пагинация по первичному ключу, без OFFSET
+        query = select(User).order_by(User.id).limit(limit)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def stream_users(self, chunk_size: int) -> AsyncIterator[Sequence[dict]]:
+        # Серверный курсор: в памяти одновременно не больше chunk_size строк
+        result = await self.session.stream(
+            select(User.id, User.username, User.email, User.created_at)
+            .order_by(User.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.mappings().partitions():
+            yield rows
+
+    async def list_emails(self, after_id: int, limit: int) -> list[tuple[int, str]]:
+        query = (
+            select(User.id, User.email)
+            .where(User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def search_usernames(
+        self, prefix: str, after: tuple[str, int] | None, limit: int
+    ) -> list[tuple[int, str]]:
+        # Диапазон вместо LIKE: не нужно экранировать % и _, и индекс
+        # используется и в generic-плане подготовленного запроса
+        lower_prefix = func.lower(literal(prefix)).collate("C")
+        query = (
+            select(User.id, User.username)
+            .where(_username_key >= lower_prefix, _username_key < lower_prefix.op("||")(_MAX_CHAR))
+            .order_by(_username_key, User.id)
+            .limit(limit)
+        )
+        if after is not None:
+            after_username, after_id = after
+            query = query.where(
+                tuple_(_username_key, User.id)
+                > tuple_(func.lower(literal(after_username)).collate("C"), literal(after_id))
+            )
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def search_usernames_fuzzy(self, query: str, limit: int) -> list[tuple[int, str]]:
+        # % отбирает кандидатов по GiST-индексу, <-> отдаёт их в порядке близости
+        lower_query = func.lower(literal(query))
+        statement = (
+            select(User.id, User.username)
+            .where(_username_trgm_key.op("%")(lower_query))
+            .order_by(_username_trgm_key.op("<->")(lower_query), User.id)
+            .limit(limit)
+        )
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(statement)
+        return [tuple(row) for row in result.all()]
+
+    async def username_exists(self, username: str) -> bool:
+        query = select(
+            exists().where(_username_key == func.lower(literal(username)).collate("C"))
+        )
+        with span("db_checkout"):
+            await self.session.connection()
+        with span("db_query"):
+            result = await self.session.execute(query)
+        return bool(result.scalar())
+
     async def create_user(
-        session: AsyncSession, username: str, email: str, hashed_password: str
+        self, username: str, email: str, hashed_password: str
     ) -> User:
         try:
             user = User(username=username, email=email, hashed_password=hashed_password)
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
+            self.session.add(user)
+            with span("db_checkout"):
+                await self.session.connection()
+            with span("db_query"):
+                await self.session.commit()
+                await self.session.refresh(user)
             return user
         except IntegrityError as e:
+            # Гонка двух регистраций одного имени: проверка в сервисе прошла у обеих
+            if "ix_users_username_lower_unique" in str(e.orig):
+                raise UserAlreadyExistsException(detail=f"Username {username} already taken")
             raise DatabaseException(internal_detail=str(e))
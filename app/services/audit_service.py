@@ -0,0 +1,138 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.database import RepositoryFactory, postgres_repository
+from app.repositories.audit_repository import AuditRepository
+from app.repositories.base import AuditRepositoryProtocol
+from app.repositories.memory_audit_repository import InMemoryAuditRepository
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+AuditRepositoryFactory = RepositoryFactory[AuditRepositoryProtocol]
+
+postgres_audit_repository = postgres_repository(AuditRepository)
+
+
+_memory_audit_repository = InMemoryAuditRepository(settings.AUDIT_QUEUE_MAX_SIZE)
+
+
+@asynccontextmanager
+async def memory_audit_repository():
+    yield _memory_audit_repository
+
+
+class LoginAuditQueue:
+    """
+    Write-behind журнал входов.
+
+    `record` только кладёт событие в буфер памяти и не ждёт БД. Фоновая задача
+    сбрасывает буфер многострочными INSERT, когда набирается `batch_size`
+    событий или проходит `flush_interval`. Обновления last_login_at
+    схлопываются до одного на пользователя за сброс. Если буфер заполнен
+    (`max_size`), новые события отбрасываются и учитываются в `dropped`.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._events: list[dict] = []
+        self._last_logins: dict[int, datetime] = {}
+        # Создаётся в start(): Event привязывается к циклу событий первого
+        # использования, а lifespan может запускаться в разных циклах
+        self._flush_requested: asyncio.Event | None = None
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    def record(
+        self,
+        user_id: int,
+        event_type: str,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ):
+        if len(self._events) >= self.max_size:
+            self.dropped += 1
+            return
+        now = datetime.now(timezone.utc)
+        self._events.append(
+            {
+                "user_id": user_id,
+                "event_type": event_type,
+                "ip_address": ip_address,
+                "user_agent": user_agent[:255] if user_agent else None,
+                "created_at": now,
+            }
+        )
+        if event_type == "login":
+            self._last_logins[user_id] = now
+        if len(self._events) >= self.batch_size and self._flush_requested is not None:
+            self._flush_requested.set()
+
+    async def flush(self, repository_factory: AuditRepositoryFactory) -> int:
+        """Записывает накопленные события пачками по batch_size"""
+        events, last_logins = self._events, self._last_logins
+        self._events, self._last_logins = [], {}
+        if not events:
+            return 0
+
+        written = 0
+        try:
+            async with repository_factory() as repository:
+                for start in range(0, len(events), self.batch_size):
+                    batch = events[start:start + self.batch_size]
+                    is_last = start + self.batch_size >= len(events)
+                    await repository.write_batch(batch, last_logins if is_last else {})
+                    written += len(batch)
+        except Exception as e:
+            self.dropped += len(events) - written
+            logger.error(f"Login audit flush failed, {len(events) - written} events lost: {e}")
+        self.written += written
+        return written
+
+    async def _run(self, repository_factory: AuditRepositoryFactory):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush(repository_factory)
+        # События, записанные во время последнего сброса
+        await self.flush(repository_factory)
+
+    def start(self, repository_factory: AuditRepositoryFactory):
+        self._stopping = False
+        self._flush_requested = asyncio.Event()
+        self._task = asyncio.create_task(self._run(repository_factory))
+
+    async def stop(self):
+        """Останавливает фоновую задачу после последнего сброса буфера"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._flush_requested.set()
+        await self._task
+        self._task = None
+        self._flush_requested = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._events),
+            "max_size": self.max_size,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+login_audit = LoginAuditQueue(
+    settings.AUDIT_QUEUE_MAX_SIZE,
+    settings.AUDIT_FLUSH_BATCH_SIZE,
+    settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
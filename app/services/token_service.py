@@ -0,0 +1,93 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.database import RepositoryFactory, postgres_repository
+from app.core.exceptions import InvalidTokenException
+from app.core.security import AuthService
+from app.core.sweeper import run_sweeper
+from app.repositories.base import RefreshTokenRepositoryProtocol
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.core.logging_config import setup_logger
+
+
+logger = setup_logger(__name__)
+
+postgres_refresh_token_repository = postgres_repository(RefreshTokenRepository)
+
+
+class TokenService:
+    @staticmethod
+    def _refresh_token_expires_at() -> datetime:
+        return datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+    @staticmethod
+    async def issue_refresh_token(
+        repository: RefreshTokenRepositoryProtocol, user_id: int
+    ) -> str:
+        """Выдаёт refresh-токен, открывающий новое семейство"""
+        jti = uuid.uuid4()
+        await repository.create(
+            jti, uuid.uuid4(), user_id, TokenService._refresh_token_expires_at()
+        )
+        return AuthService.create_refresh_token({"sub": str(user_id), "jti": jti.hex})
+
+    @staticmethod
+    async def rotate_refresh_token(
+        repository: RefreshTokenRepositoryProtocol, refresh_token: str
+    ) -> tuple[int, str]:
+        """
+        Меняет refresh-токен на новый из того же семейства.
+        Повторное использование отозванного токена отзывает всё семейство.
+        """
+        payload = AuthService.decode_token(refresh_token, expected_type="refresh")
+        try:
+            jti = uuid.UUID(payload["jti"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Missing or malformed 'jti' in refresh token")
+            raise InvalidTokenException()
+
+        new_jti = uuid.uuid4()
+        user_id = await repository.rotate(
+            jti, new_jti, TokenService._refresh_token_expires_at()
+        )
+        if user_id is None:
+            stored = await repository.get(jti)
+            if stored is not None and stored.revoked_at is not None:
+                logger.warning(
+                    f"Refresh token reuse detected, revoking family {stored.family_id}"
+                )
+                await repository.revoke_family(stored.family_id)
+            raise InvalidTokenException()
+
+        new_refresh_token = AuthService.create_refresh_token(
+            {"sub": str(user_id), "jti": new_jti.hex}
+        )
+        return user_id, new_refresh_token
+
+    @staticmethod
+    async def revoke_refresh_token(
+        repository: RefreshTokenRepositoryProtocol, refresh_token: str
+    ) -> None:
+        """Отзывает семейство токена при выходе; невалидный токен игнорируется"""
+        try:
+            payload = AuthService.decode_token(refresh_token, expected_type="refresh")
+            jti = uuid.UUID(payload["jti"])
+        except (InvalidTokenException, KeyError, TypeError, ValueError):
+            return
+        stored = await repository.get(jti)
+        if stored is not None:
+            await repository.revoke_family(stored.family_id)
+
+
+async def run_refresh_token_sweeper(
+    repository_factory: RepositoryFactory[RefreshTokenRepositoryProtocol],
+):
+    """Фоновая задача периодической очистки хранилища refresh-токенов"""
+    await run_sweeper(
+        "refresh tokens",
+        repository_factory,
+        settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS,
+        settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+        settings.REFRESH_TOKEN_SWEEP_PAUSE_MS,
+    )
@@ -1,7 +1,6 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-
+from app.core.email_filter import email_filter
 from app.core.security import AuthService
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import UserRepositoryProtocol
 from app.models.user import User
 from app.core.exceptions import UserAlreadyExistsException, InvalidCredentialsException
 from app.core.logging_config import setup_logger
@@ -13,10 +12,17 @@ logger = setup_logger(__name__)
 class UserService:
     @staticmethod
     async def authenticate_user(
-        session: AsyncSession, email: str, password: str
+        repository: UserRepositoryProtocol, email: str, password: str
     ) -> User | None:
-        user = await UserRepository.get_user_by_email(session, email)
-        if not user or not AuthService.verify_password(password, user.hashed_password):
+        # Email, которого точно нет в фильтре, не требует запроса к БД
+        user = None
+        if await email_filter.might_exist(email):
+            user = await repository.get_user_by_email(email)
+        if not user:
+            await AuthService.simulate_password_check()
+            logger.warning(f"Invalid login attempt: {email}")
+            raise InvalidCredentialsException()
+        if not AuthService.verify_password(password, user.hashed_password):
             logger.warning(f"Invalid login attempt: {email}")
             raise InvalidCredentialsException()
         return user
@@ -24,20 +30,22 @@ class UserService:
 
     @staticmethod
     async def create_user(
-        session: AsyncSession, username: str, email: str, hashed_password: str
+        repository: UserRepositoryProtocol, username: str, email: str, hashed_password: str
     ) -> User:
-        existing_user = await UserRepository.get_user_by_email(session, email)
+        existing_user = await repository.get_user_by_email(email)
         if existing_user:
             logger.warning(f"Registration attempt with existing email: {email}")
             raise UserAlreadyExistsException(detail=f"Email {email} already registered")
+        if await repository.username_exists(username):
+            logger.warning(f"Registration attempt with taken username: {username}")
+            raise UserAlreadyExistsException(detail=f"Username {username} already taken")
 
-        user = await UserRepository.create_user(
-            session, username, email, hashed_password
-        )
+        user = await repository.create_user(username, email, hashed_password)
+        email_filter.add(email)
         logger.info(f"User created: {email}")
         return user
 
     @staticmethod
-    async def get_user_by_email(session: AsyncSession, email: str) -> User:
-        user = await UserRepository.get_user_by_email(session, email)
+    async def get_user_by_email(repository: UserRepositoryProtocol, email: str) -> User:
+        user = await repository.get_user_by_email(email)
         return user
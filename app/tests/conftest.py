@@ -1,8 +1,16 @@
 import pytest
 import asyncio
+from datetime import datetime
 from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.main import app
+from app.core.dependencies import get_refresh_token_repository, get_user_repository
+from app.models.user import User
+from app.repositories.memory_refresh_token_repository import InMemoryRefreshTokenRepository
+from app.repositories.memory_user_repository import InMemoryUserRepository
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -22,5 +30,40 @@ def mock_async_session():
     return session
 
 
+@pytest.fixture
+def mock_user():
+    """Пользователь для тестов с замоканными сервисами"""
+    return User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        hashed_password="hashed_password_123",
+        created_at=datetime.utcnow(),
+    )
+
+
+@pytest.fixture
+def memory_user_repository():
+    """In-memory репозиторий пользователей"""
+    return InMemoryUserRepository()
+
+
+@pytest.fixture
+def memory_client(memory_user_repository):
+    """TestClient приложения с in-memory репозиторием пользователей"""
+    app.dependency_overrides[get_user_repository] = lambda: memory_user_repository
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_user_repository, None)
+
+
+@pytest.fixture(autouse=True)
+def memory_refresh_token_repository():
+    """In-memory хранилище refresh-токенов вместо Postgres во всех тестах"""
+    repository = InMemoryRefreshTokenRepository()
+    app.dependency_overrides[get_refresh_token_repository] = lambda: repository
+    yield repository
+    app.dependency_overrides.pop(get_refresh_token_repository, None)
+
+
 # Глобальная конфигурация pytest
 pytest_plugins = ["pytest_asyncio"]
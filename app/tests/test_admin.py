@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+
+ADMIN_HEADERS = {"X-Admin-Key": "admin-key"}
+
+
+@pytest.fixture
+def admin_client(memory_client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-key")
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 2)
+    return memory_client
+
+
+@pytest.fixture
+def five_users(memory_user_repository):
+    async def _create():
+        for i in range(5):
+            await memory_user_repository.create_user(
+                f"user{i}", f"user{i}@example.com", "hashed_password_123"
+            )
+
+    asyncio.run(_create())
+
+
+class TestAdminUsers:
+
+    def test_requires_admin_key(self, admin_client):
+        assert admin_client.get("/api/v1/admin/users").status_code == 403
+        response = admin_client.get(
+            "/api/v1/admin/users", headers={"X-Admin-Key": "wrong"}
+        )
+        assert response.status_code == 403
+
+    def test_non_ascii_key_rejected(self, admin_client):
+        response = admin_client.get(
+            "/api/v1/admin/users", headers={"X-Admin-Key": "kö".encode("latin-1")}
+        )
+        assert response.status_code == 403
+
+    def test_disabled_without_configured_key(self, admin_client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+        response = admin_client.get("/api/v1/admin/users", headers={"X-Admin-Key": ""})
+        assert response.status_code == 403
+
+    def test_keyset_pagination(self, admin_client, five_users):
+        first = admin_client.get(
+            "/api/v1/admin/users", params={"limit": 2}, headers=ADMIN_HEADERS
+        ).json()
+        assert [user["id"] for user in first["items"]] == [1, 2]
+        assert first["next_after_id"] == 2
+
+        last = admin_client.get(
+            "/api/v1/admin/users",
+            params={"limit": 2, "after_id": 4},
+            headers=ADMIN_HEADERS,
+        ).json()
+        assert [user["id"] for user in last["items"]] == [5]
+        assert last["next_after_id"] is None
+
+    def test_export_ndjson(self, admin_client, five_users):
+        response = admin_client.get("/api/v1/admin/users/export", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+        assert "hashed_password" not in rows[0]
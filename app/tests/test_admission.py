@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core import admission
+from app.core.admission import CostClass
+
+client = TestClient(app)
+
+
+@pytest.mark.asyncio
+class TestCostClass:
+
+    async def test_admits_up_to_limit(self):
+        cost_class = CostClass("test", max_in_flight=2, max_queue=0, queue_timeout=0.01)
+
+        assert await cost_class.acquire() is True
+        assert await cost_class.acquire() is True
+        assert await cost_class.acquire() is False
+        assert cost_class.stats()["shed_queue_full"] == 1
+
+    async def test_queue_timeout_sheds(self):
+        cost_class = CostClass("test", max_in_flight=1, max_queue=1, queue_timeout=0.01)
+        await cost_class.acquire()
+
+        assert await cost_class.acquire() is False
+        assert cost_class.stats()["shed_timeout"] == 1
+        assert cost_class.stats()["queued"] == 0
+
+    async def test_release_hands_slot_to_waiter(self):
+        cost_class = CostClass("test", max_in_flight=1, max_queue=1, queue_timeout=1)
+        await cost_class.acquire()
+
+        waiter = asyncio.create_task(cost_class.acquire())
+        await asyncio.sleep(0)
+        cost_class.release()
+
+        assert await waiter is True
+        assert cost_class.in_flight == 1
+        cost_class.release()
+        assert cost_class.in_flight == 0
+
+
+class TestAdmissionMiddleware:
+
+    def test_overloaded_route_is_shed(self, monkeypatch):
+        monkeypatch.setitem(
+            admission.cost_classes, "expensive", CostClass("expensive", 0, 0, 0)
+        )
+
+        login_data = {"email": "test@example.com", "password": "correct_password"}
+        response = client.post("/api/v1/auth/login", json=login_data)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+        metrics = client.get("/health/admission").json()
+        assert metrics["expensive"]["shed_queue_full"] == 1
+
+    def test_unclassified_route_is_not_limited(self, monkeypatch):
+        monkeypatch.setitem(
+            admission.cost_classes, "cheap", CostClass("cheap", 0, 0, 0)
+        )
+
+        response = client.get("/health/live")
+        assert response.status_code == 200
@@ -0,0 +1,123 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.user import User
+from app.repositories.memory_audit_repository import InMemoryAuditRepository
+from app.services.audit_service import LoginAuditQueue, login_audit
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def audit_repository():
+    return InMemoryAuditRepository()
+
+
+@pytest.fixture
+def repository_factory(audit_repository):
+    @asynccontextmanager
+    async def _factory():
+        yield audit_repository
+
+    return _factory
+
+
+@pytest.mark.asyncio
+class TestLoginAuditQueue:
+
+    async def test_flush_in_batches_and_coalesce_last_login(
+        self, audit_repository, repository_factory
+    ):
+        queue = LoginAuditQueue(max_size=100, batch_size=2, flush_interval=60)
+        queue.record(1, "login", "127.0.0.1", "pytest")
+        queue.record(1, "login")
+        queue.record(2, "refresh")
+
+        assert await queue.flush(repository_factory) == 3
+        assert len(audit_repository.events) == 3
+        assert list(audit_repository.last_logins) == [1]
+        assert audit_repository.last_logins[1] == audit_repository.events[1]["created_at"]
+        assert queue.stats()["queued"] == 0
+
+    async def test_full_queue_drops_new_events(self, repository_factory):
+        queue = LoginAuditQueue(max_size=2, batch_size=10, flush_interval=60)
+        for _ in range(3):
+            queue.record(1, "login")
+
+        assert queue.stats()["queued"] == 2
+        assert queue.stats()["dropped"] == 1
+
+    async def test_failed_flush_counts_dropped(self):
+        @asynccontextmanager
+        async def failing_factory():
+            raise ConnectionError("db down")
+            yield
+
+        queue = LoginAuditQueue(max_size=10, batch_size=10, flush_interval=60)
+        queue.record(1, "login")
+
+        assert await queue.flush(failing_factory) == 0
+        assert queue.stats()["dropped"] == 1
+
+    async def test_stop_flushes_pending(self, audit_repository, repository_factory):
+        queue = LoginAuditQueue(max_size=10, batch_size=10, flush_interval=60)
+        queue.start(repository_factory)
+        queue.record(1, "login")
+
+        await queue.stop()
+
+        assert len(audit_repository.events) == 1
+
+    async def test_memory_repository_is_bounded(self):
+        repository = InMemoryAuditRepository(max_events=2)
+        await repository.write_batch([{"user_id": i} for i in range(5)], {})
+
+        assert [event["user_id"] for event in repository.events] == [3, 4]
+        assert repository.written == 5
+
+
+class TestLoginAuditRestart:
+
+    def test_restart_in_new_event_loop(self, audit_repository, repository_factory):
+        # Как два последовательных `with TestClient(app)`: каждый lifespan в своём цикле
+        queue = LoginAuditQueue(max_size=10, batch_size=10, flush_interval=60)
+
+        async def _run_once():
+            queue.start(repository_factory)
+            queue.record(1, "login")
+            # Даём фоновой задаче дойти до ожидания Event
+            await asyncio.sleep(0.01)
+            await queue.stop()
+
+        asyncio.run(_run_once())
+        asyncio.run(_run_once())
+
+        assert len(audit_repository.events) == 2
+
+
+class TestLoginAuditEndpoint:
+
+    @patch("app.api.v1.auth.UserService.authenticate_user")
+    def test_login_is_recorded(self, mock_authenticate):
+        mock_authenticate.return_value = User(
+            id=7,
+            username="testuser",
+            email="test@example.com",
+            hashed_password="hashed_password_123",
+            created_at=datetime.utcnow(),
+        )
+        queued_before = login_audit.stats()["queued"]
+
+        login_data = {"email": "test@example.com", "password": "correct_password"}
+        response = client.post("/api/v1/auth/login", json=login_data)
+
+        assert response.status_code == 200
+        assert login_audit.stats()["queued"] == queued_before + 1
+        assert login_audit._events[-1]["user_id"] == 7
+        assert login_audit._events[-1]["event_type"] == "login"
@@ -1,28 +1,18 @@
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
 import jwt
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from app.main import app
-from app.models.user import User
 from app.core.config import settings
 from app.core.security import AuthService
+from app.services.token_service import TokenService
 
 client = TestClient(app)
 
 
-@pytest.fixture
-def mock_user():
-    return User(
-        id=1,
-        username="testuser",
-        email="test@example.com",
-        hashed_password="hashed_password_123",
-        created_at=datetime.utcnow(),
-    )
-
-
 @pytest.fixture
 def valid_access_token(mock_user):
     return AuthService.create_access_token({"sub": str(mock_user.id)})
@@ -148,13 +138,14 @@ class TestAuthEndpoints:
         assert "refresh_token" in set_cookie_header
         assert "Max-Age=0" in set_cookie_header
 
-    @patch("app.core.dependencies.AuthService.get_current_user")
     def test_refresh_token_success(
-        self, mock_get_current_user, mock_user, valid_refresh_token
+        self, mock_user, memory_refresh_token_repository
     ):
-        mock_get_current_user.return_value = mock_user
+        stored_refresh_token = asyncio.run(
+            TokenService.issue_refresh_token(memory_refresh_token_repository, mock_user.id)
+        )
 
-        cookies = {"refresh_token": valid_refresh_token}
+        cookies = {"refresh_token": stored_refresh_token}
         response = client.post("/api/v1/auth/refresh", cookies=cookies)
 
         assert response.status_code == 200
@@ -269,31 +260,29 @@ class TestAuthIntegration:
 @pytest.mark.asyncio
 class TestAsyncAuth:
 
-    @patch("app.services.user_service.UserRepository.get_user_by_email")
-    async def test_authenticate_user_success(self, mock_get_user, mock_user):
+    async def test_authenticate_user_success(self, mock_user):
         from app.services.user_service import UserService
         from app.core.security import AuthService
 
-        mock_get_user.return_value = mock_user
+        repository = AsyncMock()
+        repository.get_user_by_email.return_value = mock_user
 
         with patch.object(AuthService, "verify_password", return_value=True):
-            session = AsyncMock()
             result = await UserService.authenticate_user(
-                session, "test@example.com", "correct_password"
+                repository, "test@example.com", "correct_password"
             )
             assert result == mock_user
 
-    @patch("app.services.user_service.UserRepository.get_user_by_email")
-    async def test_authenticate_user_wrong_password(self, mock_get_user, mock_user):
+    async def test_authenticate_user_wrong_password(self, mock_user):
         from app.services.user_service import UserService
         from app.core.security import AuthService
 
-        mock_get_user.return_value = mock_user
+        repository = AsyncMock()
+        repository.get_user_by_email.return_value = mock_user
 
         with patch.object(AuthService, "verify_password", return_value=False):
-            session = AsyncMock()
             with pytest.raises(Exception):
                 result = await UserService.authenticate_user(
-                    session, "test@example.com", "wrong_password"
+                    repository, "test@example.com", "wrong_password"
                 )
 
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.email_filter import BloomFilter, EmailFilter
+from app.core.exceptions import InvalidCredentialsException
+from app.core.security import AuthService
+from app.services.user_service import UserService
+
+
+def repository_factory(repository):
+    @asynccontextmanager
+    async def factory():
+        yield repository
+    return factory
+
+
+class TestBloomFilter:
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+        emails = [f"user{i}@example.com" for i in range(1000)]
+        for email in emails:
+            bloom.add(email)
+
+        assert all(email in bloom for email in emails)
+        false_positives = sum(f"other{i}@example.com" in bloom for i in range(10_000))
+        assert false_positives < 300
+
+
+@pytest.mark.asyncio
+class TestEmailFilter:
+
+    async def test_not_ready_falls_through(self):
+        email_filter = EmailFilter(capacity=100, fp_rate=0.01, batch_size=10)
+        assert await email_filter.might_exist("missing@example.com")
+
+    async def test_build_and_definite_miss(self, memory_user_repository):
+        for i in range(25):
+            await memory_user_repository.create_user(f"user{i}", f"user{i}@example.com", "hash")
+        email_filter = EmailFilter(capacity=100, fp_rate=0.01, batch_size=10)
+        await email_filter.build(repository_factory(memory_user_repository))
+
+        assert email_filter.emails == 25
+        assert await email_filter.might_exist("user24@example.com")
+        assert not await email_filter.might_exist("missing@example.com")
+        assert email_filter.definite_misses == 1
+        # Публичные метрики не раскрывают число зарегистрированных аккаунтов
+        assert "emails" not in email_filter.stats()
+        assert email_filter.stats()["over_capacity"] is False
+
+    async def test_catch_up_sees_other_workers(self, memory_user_repository):
+        email_filter = EmailFilter(capacity=100, fp_rate=0.01, batch_size=10)
+        await email_filter.build(repository_factory(memory_user_repository))
+
+        # Пользователь зарегистрирован другим воркером, в фильтр напрямую не попал
+        await memory_user_repository.create_user("other", "other@example.com", "hash")
+        assert await email_filter.might_exist("other@example.com")
+
+    async def test_concurrent_misses_share_catch_up(self, memory_user_repository):
+        email_filter = EmailFilter(capacity=100, fp_rate=0.01, batch_size=10)
+        await email_filter.build(repository_factory(memory_user_repository))
+
+        with patch.object(
+            memory_user_repository, "list_emails", wraps=memory_user_repository.list_emails
+        ) as list_emails:
+            results = await asyncio.gather(
+                *(email_filter.might_exist(f"missing{i}@example.com") for i in range(50))
+            )
+
+        assert not any(results)
+        assert list_emails.call_count <= 2
+
+
+@pytest.mark.asyncio
+class TestLoginWithEmailFilter:
+
+    async def test_definite_miss_skips_db_and_waits(self, memory_user_repository):
+        email_filter = EmailFilter(capacity=100, fp_rate=0.01, batch_size=10)
+        await email_filter.build(repository_factory(memory_user_repository))
+        repository = AsyncMock(wraps=memory_user_repository)
+
+        with patch("app.services.user_service.email_filter", email_filter), \
+                patch.object(AuthService, "password_check_seconds", 0.05):
+            started = time.perf_counter()
+            with pytest.raises(InvalidCredentialsException):
+                await UserService.authenticate_user(repository, "missing@example.com", "Pass123")
+            elapsed = time.perf_counter() - started
+
+        repository.get_user_by_email.assert_not_called()
+        assert elapsed >= 0.05
+
+    async def test_created_user_is_added(self, memory_user_repository):
+        email_filter = EmailFilter(capacity=100, fp_rate=0.01, batch_size=10)
+        await email_filter.build(repository_factory(memory_user_repository))
+
+        with patch("app.services.user_service.email_filter", email_filter):
+            await UserService.create_user(
+                memory_user_repository, "testuser", "test@example.com", "hash"
+            )
+
+        assert "test@example.com" in email_filter._bloom
@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock
+
+from app.main import app
+from app.core import warmup
+from app.core.warmup import readiness, run_warmup
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_readiness():
+    readiness.mark_not_ready()
+    yield
+    readiness.mark_not_ready()
+
+
+class TestHealthEndpoints:
+
+    def test_live(self):
+        response = client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+
+    def test_ready_before_warmup(self):
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+
+    def test_ready_after_warmup(self):
+        readiness.mark_ready()
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_warm_up_auth(self):
+        warmup.warm_up_auth()
+
+
+@pytest.mark.asyncio
+class TestWarmup:
+
+    async def test_run_warmup_retries_until_success(self, monkeypatch):
+        monkeypatch.setattr(warmup.settings, "WARMUP_RETRY_SECONDS", 0)
+        mock_warm_up = AsyncMock(side_effect=[ConnectionError("db down"), None])
+
+        with patch("app.core.warmup.warm_up", mock_warm_up):
+            await run_warmup()
+
+        assert mock_warm_up.await_count == 2
+        assert readiness.ready is True
+
+    async def test_failure_logs_causes_not_public(self, monkeypatch):
+        monkeypatch.setattr(warmup.settings, "WARMUP_RETRY_SECONDS", 0)
+
+        # Как в warm_up: ошибка фазы приходит обёрнутой в ExceptionGroup
+        error = ExceptionGroup(
+            "unhandled errors in a TaskGroup", [ConnectionRefusedError("db down")]
+        )
+        mock_warm_up = AsyncMock(side_effect=[error, None])
+        responses = []
+
+        async def _check_ready(*args):
+            responses.append(client.get("/health/ready"))
+
+        with patch("app.core.warmup.warm_up", mock_warm_up), \
+                patch("app.core.warmup.asyncio.sleep", side_effect=_check_ready), \
+                patch.object(warmup.logger, "error") as log_error:
+            await run_warmup()
+
+        assert "ConnectionRefusedError: db down" in log_error.call_args.args[0]
+        assert responses[0].status_code == 503
+        assert responses[0].json() == {"status": "warm_up_failed"}
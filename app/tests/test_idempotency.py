@@ -0,0 +1,213 @@
+import asyncio
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.exceptions import IdempotencyKeyReusedException, UserAlreadyExistsException
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore, register_idempotency, run_idempotency_sweeper
+from app.core.security import AuthService
+from app.repositories.memory_idempotency_repository import InMemoryIdempotencyRepository
+
+
+REGISTER_DATA = {
+    "username": "testuser",
+    "email": "test@example.com",
+    "password": "StrongPass123",
+}
+
+
+@pytest.fixture
+def idempotency_repository():
+    return InMemoryIdempotencyRepository(max_keys=10)
+
+
+@pytest.fixture(autouse=True)
+def fresh_idempotency_keys(idempotency_repository, monkeypatch):
+    monkeypatch.setattr(
+        register_idempotency,
+        "repository_factory",
+        lambda: nullcontext(idempotency_repository),
+    )
+
+
+def make_store(repository, ttl=60, in_flight_timeout=30):
+    store = IdempotencyStore(ttl, in_flight_timeout, poll_interval=0.001)
+    store.repository_factory = lambda: nullcontext(repository)
+    return store
+
+
+class TestRegisterIdempotency:
+
+    def test_replay_skips_hashing(self, memory_client):
+        headers = {"Idempotency-Key": "key-1"}
+        with patch.object(
+            AuthService, "get_password_hash", wraps=AuthService.get_password_hash
+        ) as get_password_hash:
+            first = memory_client.post("/api/v1/auth/register", json=REGISTER_DATA, headers=headers)
+            second = memory_client.post("/api/v1/auth/register", json=REGISTER_DATA, headers=headers)
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert "Idempotent-Replayed" not in first.headers
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert get_password_hash.call_count == 1
+
+    def test_key_reused_with_different_body(self, memory_client):
+        headers = {"Idempotency-Key": "key-2"}
+        memory_client.post("/api/v1/auth/register", json=REGISTER_DATA, headers=headers)
+
+        other = {**REGISTER_DATA, "email": "other@example.com"}
+        response = memory_client.post("/api/v1/auth/register", json=other, headers=headers)
+        assert response.status_code == 409
+
+    def test_without_key_is_not_replayed(self, memory_client):
+        memory_client.post("/api/v1/auth/register", json=REGISTER_DATA)
+        response = memory_client.post("/api/v1/auth/register", json=REGISTER_DATA)
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestIdempotencyStore:
+
+    async def test_concurrent_duplicates_wait_for_original(self, idempotency_repository):
+        store = make_store(idempotency_repository)
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        responses = await asyncio.gather(
+            *(store.execute("key", "fp", handler) for _ in range(5))
+        )
+
+        assert calls == 1
+        assert {r.status_code for r in responses} == {200}
+        assert sum("Idempotent-Replayed" in r.headers for r in responses) == 4
+
+    async def test_client_errors_are_stored(self, idempotency_repository):
+        store = make_store(idempotency_repository)
+
+        async def handler():
+            raise UserAlreadyExistsException("Email already registered")
+
+        await store.execute("key", "fp", handler)
+        replay = await store.execute("key", "fp", handler)
+        assert replay.status_code == 400
+        assert replay.headers["Idempotent-Replayed"] == "true"
+
+        with pytest.raises(IdempotencyKeyReusedException):
+            await store.execute("key", "other", handler)
+
+    async def test_duplicate_on_other_worker_replays(self, idempotency_repository):
+        # Два воркера с общим хранилищем ключей
+        first_worker = make_store(idempotency_repository)
+        second_worker = make_store(idempotency_repository)
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        first, second = await asyncio.gather(
+            first_worker.execute("key", "fp", handler),
+            second_worker.execute("key", "fp", handler),
+        )
+
+        assert calls == 1
+        assert first.body == second.body
+        assert "Idempotent-Replayed" not in first.headers
+        assert second.headers["Idempotent-Replayed"] == "true"
+
+    async def test_server_error_releases_key(self, idempotency_repository):
+        store = make_store(idempotency_repository)
+
+        async def failing():
+            raise RuntimeError("db down")
+
+        async def handler():
+            return {"id": 1}
+
+        with pytest.raises(RuntimeError):
+            await store.execute("key", "fp", failing)
+        response = await store.execute("key", "fp", handler)
+        assert response.status_code == 200
+        assert "Idempotent-Replayed" not in response.headers
+
+    async def test_abandoned_claim_is_taken_over(self, idempotency_repository):
+        # Воркер упал, не завершив запрос: ключ занят, ответа нет
+        store = make_store(idempotency_repository, in_flight_timeout=0)
+        await idempotency_repository.claim(
+            "key", "fp", datetime.now(timezone.utc) + timedelta(seconds=60),
+            datetime.now(timezone.utc),
+        )
+
+        async def handler():
+            return {"id": 1}
+
+        response = await store.execute("key", "fp", handler)
+        assert response.status_code == 200
+        assert "Idempotent-Replayed" not in response.headers
+
+    async def test_memory_repository_is_bounded(self):
+        repository = InMemoryIdempotencyRepository(max_keys=2)
+        store = make_store(repository)
+
+        async def handler():
+            return {}
+
+        for key in ("a", "b", "c"):
+            await store.execute(key, "fp", handler)
+        assert list(repository._records) == ["b", "c"]
+
+    async def test_expired_response_is_recomputed(self, idempotency_repository):
+        store = make_store(idempotency_repository, ttl=0)
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            return {}
+
+        await store.execute("key", "fp", handler)
+        replay = await store.execute("key", "fp", handler)
+        assert calls == 2
+        assert "Idempotent-Replayed" not in replay.headers
+
+    async def test_delete_expired(self, idempotency_repository):
+        store = make_store(idempotency_repository, ttl=0)
+
+        async def handler():
+            return {}
+
+        for key in ("a", "b", "c"):
+            await store.execute(key, "fp", handler)
+        assert await idempotency_repository.delete_expired(batch_size=2) == 2
+        assert await idempotency_repository.delete_expired(batch_size=2) == 1
+
+    async def test_sweeper_uses_own_settings(self, idempotency_repository, monkeypatch):
+        monkeypatch.setattr(settings, "IDEMPOTENCY_SWEEP_INTERVAL_SECONDS", 0)
+        monkeypatch.setattr(settings, "IDEMPOTENCY_SWEEP_PAUSE_MS", 0)
+        monkeypatch.setattr(settings, "IDEMPOTENCY_SWEEP_BATCH_SIZE", 1)
+        store = make_store(idempotency_repository, ttl=0)
+
+        async def handler():
+            return {}
+
+        for key in ("a", "b", "c"):
+            await store.execute(key, "fp", handler)
+
+        sweeper = asyncio.create_task(
+            run_idempotency_sweeper(lambda: nullcontext(idempotency_repository))
+        )
+        await asyncio.sleep(0.01)
+        sweeper.cancel()
+
+        assert not idempotency_repository._records
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# Около 1.5x от замеров (0.71-0.86 с после ленивого импорта Alembic): запас на шум CI,
+# но возврат Alembic (0.3-0.4 с) или другой тяжёлой зависимости выходит за бюджет
+IMPORT_TIME_BUDGET_US = 1_300_000
+
+# Модули, которые нужны только вне пути обработки запросов
+LAZY_MODULES = ("alembic", "mako")
+
+
+def _import_app(cwd) -> dict[str, int]:
+    """Импортирует app.main в отдельном процессе, возвращает накопленное время по модулям"""
+    env = {**os.environ, "PYTHONPATH": BASE_DIR}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.split("|")
+        cumulative[module.strip()] = int(cumulative_us)
+    return cumulative
+
+
+class TestImportTime:
+
+    def test_app_import_budget(self, tmp_path):
+        cumulative = _import_app(tmp_path)
+
+        assert cumulative["app.main"] < IMPORT_TIME_BUDGET_US
+        assert not [
+            module for module in cumulative
+            if module.split(".")[0] in LAZY_MODULES
+        ]
+        # Лог-файл создаётся при первой записи, а не при импорте
+        assert not (tmp_path / "app.log").exists()
@@ -0,0 +1,72 @@
+import time
+
+import jwt
+import pytest
+
+from app.core.jwt_codec import HMACJWTCodec, build_jwt_codec, PyJWTCodec
+
+KEY = "test-secret-key"
+
+
+@pytest.fixture
+def codec():
+    return HMACJWTCodec(KEY, "HS256")
+
+
+@pytest.fixture
+def claims():
+    now = int(time.time())
+    return {"sub": "1", "exp": now + 60, "type": "access", "iat": now}
+
+
+class TestHMACJWTCodec:
+
+    def test_output_matches_pyjwt(self, codec, claims):
+        assert codec.encode(claims) == jwt.encode(claims, KEY, algorithm="HS256")
+
+    @pytest.mark.parametrize("algorithm", ["HS384", "HS512"])
+    def test_other_hmac_algorithms(self, algorithm, claims):
+        codec = HMACJWTCodec(KEY, algorithm)
+        assert codec.encode(claims) == jwt.encode(claims, KEY, algorithm=algorithm)
+
+    def test_roundtrip_with_pyjwt(self, codec, claims):
+        assert codec.decode(jwt.encode(claims, KEY, algorithm="HS256")) == claims
+        assert jwt.decode(codec.encode(claims), KEY, algorithms=["HS256"]) == claims
+        assert codec.decode(codec.encode(claims).encode("ascii")) == claims
+
+    def test_tampered_signature(self, codec, claims):
+        token = codec.encode(claims)
+        tampered = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+        with pytest.raises(jwt.InvalidSignatureError):
+            codec.decode(tampered)
+
+    def test_wrong_key(self, codec, claims):
+        token = jwt.encode(claims, "other-key", algorithm="HS256")
+        with pytest.raises(jwt.InvalidSignatureError):
+            codec.decode(token)
+
+    def test_other_algorithm_rejected(self, codec, claims):
+        token = jwt.encode(claims, KEY, algorithm="HS512")
+        with pytest.raises(jwt.InvalidAlgorithmError):
+            codec.decode(token)
+
+    def test_expired(self, codec, claims):
+        claims["exp"] = int(time.time()) - 1
+        with pytest.raises(jwt.ExpiredSignatureError):
+            codec.decode(codec.encode(claims))
+
+    def test_not_yet_valid(self, codec, claims):
+        claims["nbf"] = int(time.time()) + 60
+        with pytest.raises(jwt.ImmatureSignatureError):
+            codec.decode(codec.encode(claims))
+
+    @pytest.mark.parametrize(
+        "token", ["", "invalid.token.here", "a.b", "тoken", "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.."]
+    )
+    def test_malformed(self, codec, token):
+        with pytest.raises(jwt.PyJWTError):
+            codec.decode(token)
+
+    def test_build_codec(self):
+        assert isinstance(build_jwt_codec(KEY, "HS256"), HMACJWTCodec)
+        assert isinstance(build_jwt_codec(KEY, "RS256"), PyJWTCodec)
@@ -0,0 +1,50 @@
+import pytest
+
+from app.core.exceptions import DatabaseException
+
+
+@pytest.mark.asyncio
+class TestInMemoryUserRepository:
+
+    async def test_create_and_get(self, memory_user_repository):
+        user = await memory_user_repository.create_user(
+            "testuser", "test@example.com", "hashed_password_123"
+        )
+
+        assert user.id == 1
+        assert user.created_at is not None
+        assert await memory_user_repository.get_user_by_id(1) is user
+        assert await memory_user_repository.get_user_by_email("test@example.com") is user
+        assert await memory_user_repository.get_user_by_email("other@example.com") is None
+
+    async def test_unique_email(self, memory_user_repository):
+        await memory_user_repository.create_user("first", "test@example.com", "hash")
+
+        with pytest.raises(DatabaseException):
+            await memory_user_repository.create_user("second", "test@example.com", "hash")
+
+
+class TestInMemoryBackendFlow:
+
+    def test_register_login_me(self, memory_client):
+        register_data = {
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "StrongPass123",
+        }
+        assert memory_client.post("/api/v1/auth/register", json=register_data).status_code == 200
+
+        duplicate = memory_client.post("/api/v1/auth/register", json=register_data)
+        assert duplicate.status_code == 400
+
+        login_data = {"email": "test@example.com", "password": "StrongPass123"}
+        login_response = memory_client.post("/api/v1/auth/login", json=login_data)
+        assert login_response.status_code == 200
+
+        wrong_login = {"email": "test@example.com", "password": "WrongPass123"}
+        assert memory_client.post("/api/v1/auth/login", json=wrong_login).status_code == 401
+
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+        me_response = memory_client.get("/api/v1/auth/me", headers=headers)
+        assert me_response.status_code == 200
+        assert me_response.json()["email"] == "test@example.com"
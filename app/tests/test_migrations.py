@@ -0,0 +1,33 @@
+import io
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def _alembic_config(output_buffer=None) -> Config:
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"), output_buffer=output_buffer)
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "alembic"))
+    return config
+
+
+class TestMigrations:
+
+    def test_single_head(self):
+        script = ScriptDirectory.from_config(_alembic_config())
+        assert len(script.get_heads()) == 1
+
+    def test_index_changes_are_concurrent(self):
+        buffer = io.StringIO()
+        command.upgrade(_alembic_config(buffer), "4b7e2c91d0a3:head", sql=True)
+
+        assert "DROP INDEX CONCURRENTLY IF EXISTS ix_users_id" in buffer.getvalue()
+        assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_prefix" in buffer.getvalue()
+        assert "DROP INDEX CONCURRENTLY IF EXISTS ix_users_username;" in buffer.getvalue()
+        assert (
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_lower_unique"
+            in buffer.getvalue()
+        )
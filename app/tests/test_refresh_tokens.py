@@ -0,0 +1,93 @@
+import asyncio
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.core.exceptions import InvalidTokenException
+from app.core.security import AuthService
+from app.core.sweeper import sweep_expired
+from app.services.token_service import TokenService, run_refresh_token_sweeper
+
+client = TestClient(app)
+
+
+@pytest.mark.asyncio
+class TestRefreshTokenRotation:
+
+    async def test_rotation_invalidates_previous(self, memory_refresh_token_repository):
+        token = await TokenService.issue_refresh_token(memory_refresh_token_repository, 1)
+
+        user_id, new_token = await TokenService.rotate_refresh_token(
+            memory_refresh_token_repository, token
+        )
+        assert user_id == 1
+        assert new_token != token
+
+        with pytest.raises(InvalidTokenException):
+            await TokenService.rotate_refresh_token(memory_refresh_token_repository, token)
+
+    async def test_reuse_revokes_family(self, memory_refresh_token_repository):
+        token = await TokenService.issue_refresh_token(memory_refresh_token_repository, 1)
+        _, new_token = await TokenService.rotate_refresh_token(
+            memory_refresh_token_repository, token
+        )
+
+        with pytest.raises(InvalidTokenException):
+            await TokenService.rotate_refresh_token(memory_refresh_token_repository, token)
+        # Токен, выданный при ротации, тоже отозван
+        with pytest.raises(InvalidTokenException):
+            await TokenService.rotate_refresh_token(
+                memory_refresh_token_repository, new_token
+            )
+
+    async def test_unknown_token_rejected(self, memory_refresh_token_repository):
+        token = AuthService.create_refresh_token({"sub": "1", "jti": uuid4().hex})
+        with pytest.raises(InvalidTokenException):
+            await TokenService.rotate_refresh_token(memory_refresh_token_repository, token)
+
+    async def test_sweep_deletes_expired_in_batches(self, memory_refresh_token_repository):
+        expired_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        for _ in range(5):
+            await memory_refresh_token_repository.create(uuid4(), uuid4(), 1, expired_at)
+        await TokenService.issue_refresh_token(memory_refresh_token_repository, 1)
+
+        deleted = await sweep_expired(memory_refresh_token_repository, batch_size=2, pause=0)
+
+        assert deleted == 5
+        assert len(memory_refresh_token_repository._tokens) == 1
+
+    async def test_sweeper_runs_on_memory_backend(
+        self, memory_refresh_token_repository, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS", 0)
+        expired_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await memory_refresh_token_repository.create(uuid4(), uuid4(), 1, expired_at)
+
+        sweeper = asyncio.create_task(
+            run_refresh_token_sweeper(lambda: nullcontext(memory_refresh_token_repository))
+        )
+        await asyncio.sleep(0.01)
+        sweeper.cancel()
+
+        assert not memory_refresh_token_repository._tokens
+
+
+class TestRefreshEndpoint:
+
+    def test_reused_cookie_rejected(self, memory_refresh_token_repository):
+        token = asyncio.run(
+            TokenService.issue_refresh_token(memory_refresh_token_repository, 1)
+        )
+
+        client.cookies.set("refresh_token", token)
+        assert client.post("/api/v1/auth/refresh").status_code == 200
+
+        client.cookies.clear()
+        client.cookies.set("refresh_token", token)
+        assert client.post("/api/v1/auth/refresh").status_code == 401
+        client.cookies.clear()
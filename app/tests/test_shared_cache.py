@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.exceptions import InvalidTokenException
+from app.core.security import AuthService, jwt_codec
+from app.core.shared_cache import SharedCache, _SEQ
+from app.models.user import User
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def shared_cache(cache_path):
+    cache = SharedCache(cache_path, slots=64, slot_size=128, secret="secret")
+    yield cache
+    cache.close()
+
+
+class TestSharedCache:
+
+    def test_visible_to_other_mappings(self, shared_cache, cache_path):
+        assert shared_cache.set(b"ns", b"key", b"value", ttl=60)
+
+        # Второй mmap того же файла - как другой воркер
+        other = SharedCache(cache_path, slots=64, slot_size=128, secret="secret")
+        try:
+            assert other.get(b"ns", b"key") == b"value"
+            assert other.get(b"other", b"key") is None
+        finally:
+            other.close()
+
+    def test_expired_and_oversized(self, shared_cache):
+        shared_cache.set(b"ns", b"key", b"value", ttl=60)
+        with patch("app.core.shared_cache.time.time", return_value=10**10):
+            assert shared_cache.get(b"ns", b"key") is None
+
+        assert not shared_cache.set(b"ns", b"big", b"x" * 128, ttl=60)
+
+    def test_slot_being_written_is_a_miss(self, shared_cache):
+        shared_cache.set(b"ns", b"key", b"value", ttl=60)
+        _, offset = shared_cache._locate(b"ns", b"key")
+        seq = _SEQ.unpack_from(shared_cache._mm, offset)[0]
+
+        _SEQ.pack_into(shared_cache._mm, offset, seq + 1)
+        assert shared_cache.get(b"ns", b"key") is None
+        _SEQ.pack_into(shared_cache._mm, offset, seq + 2)
+        assert shared_cache.get(b"ns", b"key") == b"value"
+
+
+class TestGetCurrentUserCache:
+
+    def test_second_lookup_skips_repository(self, shared_cache):
+        user = User(
+            id=42,
+            username="testuser",
+            email="test@example.com",
+            hashed_password="hash",
+            created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+        repository = AsyncMock()
+        repository.get_user_by_id.return_value = user
+        # Токен с фиксированными iat/exp: от текущего времени не зависит и слот
+        token = jwt_codec.encode(
+            {"sub": "42", "type": "access", "iat": 1_767_225_600, "exp": 4_102_444_800}
+        )
+        # Записи токена и пользователя в разных слотах, иначе вторая вытеснила бы первую
+        assert (
+            shared_cache._locate(b"access", token.encode())[1]
+            != shared_cache._locate(b"user", b"42")[1]
+        )
+
+        with patch("app.core.security.get_shared_cache", return_value=shared_cache):
+            asyncio.run(AuthService.get_current_user(token, repository))
+            cached = asyncio.run(AuthService.get_current_user(token, repository))
+
+            with pytest.raises(InvalidTokenException):
+                asyncio.run(AuthService.get_current_user(token, repository, "refresh"))
+
+        repository.get_user_by_id.assert_awaited_once_with(42)
+        assert (cached.id, cached.username, cached.email, cached.created_at) == (
+            42, "testuser", "test@example.com", user.created_at
+        )
@@ -0,0 +1,71 @@
+import contextvars
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.core.timing import start_request_timings, span
+
+client = TestClient(app)
+
+
+class TestRequestTimings:
+
+    def test_span_accumulates(self):
+        def _request():
+            timings = start_request_timings()
+            with span("db_query"):
+                pass
+            with span("db_query"):
+                pass
+            return timings
+
+        # Своя копия контекста, чтобы timings не остался текущим для следующих тестов
+        timings = contextvars.copy_context().run(_request)
+
+        assert list(timings.spans) == ["db_query"]
+        header = timings.server_timing_header()
+        assert header.startswith("db_query;dur=")
+        assert "total;dur=" in header
+
+    @patch("app.api.v1.auth.UserService.authenticate_user")
+    def test_server_timing_header(self, mock_authenticate, mock_user):
+        mock_authenticate.return_value = mock_user
+
+        login_data = {"email": "test@example.com", "password": "correct_password"}
+        response = client.post("/api/v1/auth/login", json=login_data)
+
+        assert response.status_code == 200
+        server_timing = response.headers["server-timing"]
+        assert "jwt;dur=" in server_timing
+        assert "total;dur=" in server_timing
+
+
+class TestSamplingProfiler:
+
+    def test_profile_by_header(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+        monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+
+        response = client.get("/api/v1/auth/me", headers={"X-Profile": "secret"})
+
+        assert response.status_code == 401
+        assert len(list(tmp_path.glob("*-api_v1_auth_me.folded"))) == 1
+
+    def test_wrong_token_not_profiled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+        monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+
+        client.get("/api/v1/auth/me", headers={"X-Profile": "wrong"})
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_non_ascii_token_not_profiled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+        monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+
+        response = client.get("/health/live", headers={"X-Profile": "sécret".encode("latin-1")})
+
+        assert response.status_code == 200
+        assert list(tmp_path.iterdir()) == []
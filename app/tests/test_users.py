@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.core.exceptions import UserAlreadyExistsException
+
+
+USERNAMES = ["alice", "Alicia", "alina", "al_x", "bob", "Robert"]
+
+
+@pytest.fixture(autouse=True)
+def users(memory_user_repository):
+    async def _create():
+        for i, username in enumerate(USERNAMES):
+            await memory_user_repository.create_user(
+                username, f"user{i}@example.com", "hashed_password_123"
+            )
+
+    asyncio.run(_create())
+
+
+class TestUsernameSearch:
+
+    def test_prefix_search_pages(self, memory_client):
+        first = memory_client.get(
+            "/api/v1/users/search", params={"prefix": "AL", "limit": 3}
+        ).json()
+        assert [item["username"] for item in first["items"]] == ["al_x", "alice", "Alicia"]
+        assert first["next_after_username"] == "Alicia"
+
+        second = memory_client.get(
+            "/api/v1/users/search",
+            params={
+                "prefix": "al",
+                "limit": 3,
+                "after_username": first["next_after_username"],
+                "after_id": first["next_after_id"],
+            },
+        ).json()
+        assert [item["username"] for item in second["items"]] == ["alina"]
+        assert second["next_after_username"] is None
+
+    def test_wildcards_are_literal(self, memory_client):
+        response = memory_client.get("/api/v1/users/search", params={"prefix": "al_"})
+        assert [item["username"] for item in response.json()["items"]] == ["al_x"]
+
+        response = memory_client.get("/api/v1/users/search", params={"prefix": "%"})
+        assert response.json()["items"] == []
+
+    def test_limit_is_capped(self, memory_client):
+        response = memory_client.get("/api/v1/users/search", params={"prefix": "a", "limit": 21})
+        assert response.status_code == 422
+
+    def test_fuzzy_search(self, memory_client):
+        response = memory_client.get("/api/v1/users/search/fuzzy", params={"q": "alic"})
+        usernames = [item["username"] for item in response.json()["items"]]
+        assert usernames == ["alice", "Alicia", "alina"]
+
+    def test_availability(self, memory_client):
+        taken = memory_client.get("/api/v1/users/availability", params={"username": "ALICE"})
+        assert taken.json() == {"username": "ALICE", "available": False}
+
+        free = memory_client.get("/api/v1/users/availability", params={"username": "alicea"})
+        assert free.json()["available"] is True
+
+
+class TestUsernameUniqueness:
+
+    def test_register_taken_username_in_other_case(self, memory_client):
+        response = memory_client.post(
+            "/api/v1/auth/register",
+            json={"username": "ALICE", "email": "new@example.com", "password": "StrongPass123"},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Username ALICE already taken"
+
+    def test_repository_rejects_duplicate(self, memory_user_repository):
+        with pytest.raises(UserAlreadyExistsException):
+            asyncio.run(
+                memory_user_repository.create_user(
+                    "Bob", "new@example.com", "hashed_password_123"
+                )
+            )
@@ -0,0 +1,45 @@
+"""
+Сравнение HMACJWTCodec с PyJWT на горячем пути AuthService.
+
+Запуск из корня проекта:
+    python -m benchmarks.jwt_codec
+"""
+import timeit
+from datetime import datetime, timedelta
+
+import jwt
+
+from app.core.config import settings
+from app.core.jwt_codec import HMACJWTCodec
+
+
+NUMBER = 20_000
+
+
+def _pyjwt_encode():
+    to_encode = {"sub": "1"}.copy()
+    expire = datetime.utcnow() + timedelta(minutes=30)
+    to_encode.update({"exp": expire, "type": "access", "iat": datetime.utcnow()})
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+
+
+def main():
+    codec = HMACJWTCodec(settings.SECRET_KEY, "HS256")
+    token = _pyjwt_encode()
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+
+    cases = {
+        "encode pyjwt": _pyjwt_encode,
+        "encode codec": lambda: codec.encode(claims),
+        "decode pyjwt": lambda: jwt.decode(
+            token.encode("utf-8"), settings.SECRET_KEY, algorithms=["HS256"]
+        ),
+        "decode codec": lambda: codec.decode(token),
+    }
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:<14} {best / NUMBER * 1e6:8.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()